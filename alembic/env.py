@@ -3,12 +3,12 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 
 from alembic import context
-from src.database import SQLALCHEMY_DATABASE_URL
+from src.database import get_database_url
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+config.set_main_option("sqlalchemy.url", get_database_url())
 
 
 # Interpret the config file for Python logging.
@@ -21,7 +21,7 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from src.database import Base  # noqa: E402
-from src.snowball.models import BacktestResult, Stock  # noqa: F401, E402
+from src.snowball.models import BacktestJob, BacktestResult, Stock  # noqa: F401, E402
 
 target_metadata = Base.metadata
 
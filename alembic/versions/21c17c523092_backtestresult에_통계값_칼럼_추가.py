@@ -0,0 +1,154 @@
+"""BacktestResult에 통계값 칼럼 추가
+
+Revision ID: 21c17c523092
+Revises: e7b9313b7dfb
+Create Date: 2026-10-17 12:41:50.208336
+
+"""
+
+import struct
+from typing import Sequence, Union
+
+import numpy as np
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "21c17c523092"
+down_revision: Union[str, None] = "e7b9313b7dfb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+METRICS = ("total_return", "cagr", "vol", "sharpe", "mdd")
+RISK_FREE_RATE = 0.02
+
+# 이 리비전 시점의 src.snowball.codec 형식을 복사해 둠 (앱 코드가 바뀌어도 결과가 같도록)
+# 헤더: magic, 버전, 플래그, 예약, 행 수, 열 수, 열 이름 바이트 수
+_HEADER = struct.Struct("<4sBBHIII")
+_MAGIC = b"SNBT"
+_VERSION = 1
+_FLAG_ZSTD = 0x01
+_FLAG_DAY_DELTAS = 0x02
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _decode_series(blob: bytes) -> tuple[np.ndarray, tuple[str, ...], np.ndarray]:
+    """바이너리를 (epoch-day, 열 이름, (N, C) 값) 으로 디코딩 (zstd·날짜 간격 형식 포함)"""
+    magic, version, flags, _, n_rows, n_cols, names_len = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("지원하지 않는 시계열 바이너리 형식입니다.")
+    offset = _HEADER.size
+    if flags & _FLAG_ZSTD:
+        import zstandard
+
+        blob = b"\0" * offset + zstandard.ZstdDecompressor().decompress(blob[offset:])
+
+    columns = (
+        tuple(blob[offset : offset + names_len].decode().split("\n")) if n_cols else ()
+    )
+    offset += names_len + _pad(offset + names_len)
+    if flags & _FLAG_DAY_DELTAS:
+        first = np.frombuffer(blob, dtype="<i4", count=1, offset=offset)[0]
+        deltas = np.frombuffer(blob, dtype="<u2", count=n_rows - 1, offset=offset + 4)
+        days = first + np.concatenate([[0], np.cumsum(deltas, dtype=np.int64)])
+        day_size = 4 + 2 * (n_rows - 1)
+    else:
+        days = np.frombuffer(blob, dtype="<i4", count=n_rows, offset=offset)
+        day_size = 4 * n_rows
+    offset += day_size + _pad(day_size)
+    values = np.frombuffer(blob, dtype="<f8", count=n_rows * n_cols, offset=offset)
+    return days, columns, values.reshape(n_cols, n_rows).T
+
+
+def _last_rebalance_weight(blob: bytes) -> dict[str, float]:
+    """마지막 리밸런싱 비중 {ticker: weight}"""
+    _, tickers, weights = _decode_series(blob)
+    if not len(weights):
+        return {}
+    return {ticker: float(weight) for ticker, weight in zip(tickers, weights[-1])}
+
+
+def _performance(blob: bytes) -> dict[str, float]:
+    """NAV 시계열의 통계값 (flows.calculate_performance_arrays 와 같은 계산)"""
+    days, columns, values = _decode_series(blob)
+    nav = values[:, columns.index("nav")]
+    returns = nav[1:] / nav[:-1] - 1
+
+    total_return = nav[-1] / nav[0] - 1
+    num_years = int(days[-1] - days[0]) / 365.25
+    cagr = (nav[-1] / nav[0]) ** (1 / num_years) - 1
+    # 표본 표준편차 (수익률이 2개 미만이면 NaN)
+    volatility = (
+        returns.std(ddof=1) * np.sqrt(252) if len(returns) > 1 else np.float64(np.nan)
+    )
+    sharpe = (cagr - RISK_FREE_RATE) / volatility if volatility != 0 else np.nan
+    mdd = (nav / np.maximum.accumulate(nav) - 1).min()
+    return {
+        "total_return": float(total_return),
+        "cagr": float(cagr),
+        "vol": float(volatility),
+        "sharpe": float(sharpe),
+        "mdd": float(mdd),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    for metric in METRICS:
+        op.add_column("backtest_results", sa.Column(metric, sa.Float(), nullable=True))
+    op.add_column(
+        "backtest_results",
+        sa.Column("last_rebalance_weight", sa.JSON(), nullable=True),
+    )
+    # ### end Alembic commands ###
+
+    # 기존 행의 통계값과 마지막 비중 채우기
+    conn = op.get_bind()
+    table = sa.table(
+        "backtest_results",
+        sa.column("data_id", sa.Integer()),
+        sa.column("nav_history", sa.LargeBinary()),
+        sa.column("rebalance_weights", sa.LargeBinary()),
+        sa.column("last_rebalance_weight", sa.JSON()),
+        *[sa.column(metric, sa.Float()) for metric in METRICS],
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.data_id, table.c.nav_history, table.c.rebalance_weights)
+            .where(table.c.data_id > last_id)
+            .order_by(table.c.data_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for data_id, nav_history, rebalance_weights in rows:
+            values = {
+                "last_rebalance_weight": _last_rebalance_weight(
+                    bytes(rebalance_weights)
+                )
+            }
+            try:
+                values.update(_performance(bytes(nav_history)))
+            except (IndexError, ZeroDivisionError):
+                # 리밸런싱이 1회 이하라 통계값을 계산할 수 없는 행은 NULL 로 둠
+                pass
+            conn.execute(
+                table.update().where(table.c.data_id == data_id).values(values)
+            )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column("backtest_results", "last_rebalance_weight")
+    for metric in reversed(METRICS):
+        op.drop_column("backtest_results", metric)
+    # ### end Alembic commands ###
@@ -0,0 +1,165 @@
+"""BacktestResult 시계열 바이너리 저장으로 변경
+
+Revision ID: e7b9313b7dfb
+Revises: 285cf926b07e
+Create Date: 2026-10-17 11:26:05.734102
+
+"""
+
+import struct
+from typing import Sequence, Union
+
+import numpy as np
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b9313b7dfb"
+down_revision: Union[str, None] = "285cf926b07e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("nav_history", "rebalance_weights")
+BATCH_SIZE = 500
+
+# 이 리비전 시점의 src.snowball.codec 형식을 복사해 둠 (앱 코드가 바뀌어도 결과가 같도록)
+# 헤더: magic, 버전, 플래그, 예약, 행 수, 열 수, 열 이름 바이트 수
+_HEADER = struct.Struct("<4sBBHIII")
+_MAGIC = b"SNBT"
+_VERSION = 1
+_FLAG_ZSTD = 0x01
+_FLAG_DAY_DELTAS = 0x02
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _encode_series(days: np.ndarray, columns: tuple[str, ...], values) -> bytes:
+    """(epoch-day, float64 열) 을 압축 없이 열 단위 바이너리로 인코딩"""
+    names = "\n".join(columns).encode()
+    day_bytes = np.asarray(days, dtype="<i4").tobytes()
+    return b"".join(
+        [
+            _HEADER.pack(_MAGIC, _VERSION, 0, 0, len(days), len(columns), len(names)),
+            names,
+            b"\0" * _pad(_HEADER.size + len(names)),
+            day_bytes,
+            b"\0" * _pad(len(day_bytes)),
+            np.asarray(values, dtype="<f8")
+            .reshape(len(days), len(columns))
+            .T.tobytes(),
+        ]
+    )
+
+
+def _decode_series(blob: bytes) -> tuple[np.ndarray, tuple[str, ...], np.ndarray]:
+    """바이너리를 (epoch-day, 열 이름, (N, C) 값) 으로 디코딩 (zstd·날짜 간격 형식 포함)"""
+    magic, version, flags, _, n_rows, n_cols, names_len = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("지원하지 않는 시계열 바이너리 형식입니다.")
+    offset = _HEADER.size
+    if flags & _FLAG_ZSTD:
+        import zstandard
+
+        blob = b"\0" * offset + zstandard.ZstdDecompressor().decompress(blob[offset:])
+
+    columns = (
+        tuple(blob[offset : offset + names_len].decode().split("\n")) if n_cols else ()
+    )
+    offset += names_len + _pad(offset + names_len)
+    if flags & _FLAG_DAY_DELTAS:
+        first = np.frombuffer(blob, dtype="<i4", count=1, offset=offset)[0]
+        deltas = np.frombuffer(blob, dtype="<u2", count=n_rows - 1, offset=offset + 4)
+        days = first + np.concatenate([[0], np.cumsum(deltas, dtype=np.int64)])
+        day_size = 4 + 2 * (n_rows - 1)
+    else:
+        days = np.frombuffer(blob, dtype="<i4", count=n_rows, offset=offset)
+        day_size = 4 * n_rows
+    offset += day_size + _pad(day_size)
+    values = np.frombuffer(blob, dtype="<f8", count=n_rows * n_cols, offset=offset)
+    return days, columns, values.reshape(n_cols, n_rows).T
+
+
+def _records_to_blob(records: list[dict]) -> bytes:
+    """JSON 레코드 목록([{"date": ..., 값...}]) 을 바이너리로 변환"""
+    columns = tuple(k for k in records[0] if k != "date") if records else ("nav",)
+    days = np.asarray(
+        [record["date"][:10] for record in records], dtype="datetime64[D]"
+    ).astype(np.int32)
+    values = np.array(
+        [[record[c] for c in columns] for record in records], dtype=np.float64
+    )
+    return _encode_series(days, columns, values)
+
+
+def _blob_to_records(blob: bytes) -> list[dict]:
+    days, columns, values = _decode_series(blob)
+    return [
+        {"date": f"{date}T00:00:00", **dict(zip(columns, row.tolist()))}
+        for date, row in zip(days.astype("datetime64[D]"), values)
+    ]
+
+
+def _convert(source_type, target_type, convert) -> None:
+    """COLUMNS 를 target_type 의 임시 칼럼으로 변환해 채운 뒤 원래 칼럼과 교체"""
+    conn = op.get_bind()
+    for column in COLUMNS:
+        op.add_column(
+            "backtest_results", sa.Column(f"{column}_new", target_type, nullable=True)
+        )
+
+    table = sa.table(
+        "backtest_results",
+        sa.column("data_id", sa.Integer()),
+        *[sa.column(c, source_type) for c in COLUMNS],
+        *[sa.column(f"{c}_new", target_type) for c in COLUMNS],
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.data_id, *[table.c[c] for c in COLUMNS])
+            .where(table.c.data_id > last_id)
+            .order_by(table.c.data_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for data_id, *values in rows:
+            conn.execute(
+                table.update()
+                .where(table.c.data_id == data_id)
+                .values(
+                    {f"{c}_new": convert(value) for c, value in zip(COLUMNS, values)}
+                )
+            )
+        last_id = rows[-1][0]
+
+    for column in COLUMNS:
+        op.drop_column("backtest_results", column)
+        op.alter_column(
+            "backtest_results",
+            f"{column}_new",
+            new_column_name=column,
+            existing_type=target_type,
+            nullable=False,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _convert(
+        sa.JSON(),
+        sa.LargeBinary(),
+        _records_to_blob,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _convert(
+        sa.LargeBinary(),
+        sa.JSON(),
+        lambda blob: _blob_to_records(bytes(blob)),
+    )
@@ -0,0 +1,37 @@
+"""벤치마크·테스트가 함께 쓰는 설정 기본값과 기준 결과 비교"""
+
+import os
+from typing import Any
+
+# 설정 클래스가 import 시 요구하는 DB 접속 정보만 채움 (벤치마크·테스트는 DB 에 접속하지 않음)
+DUMMY_ENV = {
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+}
+
+
+def set_dummy_env() -> None:
+    """이미 설정된 값은 그대로 두고 DUMMY_ENV 를 환경 변수에 채움"""
+    for key, value in DUMMY_ENV.items():
+        os.environ.setdefault(key, value)
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[dict[str, Any]]:
+    """같은 key 의 min_sec 비율을 비교해 threshold 넘게 느려진 항목 반환"""
+    baseline_by_key = {r["key"]: r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = baseline_by_key.get(result["key"])
+        if base is None:
+            continue
+        ratio = result["min_sec"] / base["min_sec"]
+        result["baseline_min_sec"] = base["min_sec"]
+        result["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(result)
+    return regressions
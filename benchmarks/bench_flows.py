@@ -0,0 +1,279 @@
+"""flows.py 수치 계산 마이크로 벤치마크 (DB 없이 합성 가격으로 실행)
+
+# 결과를 JSON 으로 저장
+python -m benchmarks.bench_flows --output bench.json
+# 저장해 둔 기준 결과와 비교 (min 기준 10% 넘게 느려지면 종료 코드 1)
+python -m benchmarks.bench_flows --baseline bench.json --threshold 0.1
+# 일부 함수·크기만 실행
+python -m benchmarks.bench_flows --only simulate --years 1 10 50 --tickers 5 50
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import compare, set_dummy_env
+
+# flows 를 import 하면 캐시 크기 등 설정을 읽으므로 설정 값만 채움
+set_dummy_env()
+
+from src.snowball.engine import simulate  # noqa: E402
+from src.snowball.flows import (  # noqa: E402
+    TICKERS,
+    calculate_performance,
+    calculate_performance_arrays,
+    calculate_rebalance_date_and_weights,
+    calculate_rebalance_schedule,
+    calculate_weights,
+    compute_backtest,
+    simulate_backtest_loop,
+)
+from src.snowball.prices import PriceMatrix  # noqa: E402
+from src.snowball.schema import BacktestReq  # noqa: E402
+from src.snowball.strategies import DEFAULT_STRATEGY, DualMomentum  # noqa: E402
+
+START_YEAR = 1970
+# 행 단위 루프로 구현된 참조 구현은 이 연수까지만 실행 (그 이상은 너무 느림)
+REFERENCE_MAX_YEARS = 20
+
+
+def make_price_matrix(years: int, n_tickers: int, seed: int = 0) -> PriceMatrix:
+    """영업일 기준 years 년, 종목 n_tickers 개의 기하 브라운 운동 가격 행렬
+
+    앞 5개 종목은 기본 전략이 사용하는 TICKERS, 나머지는 FILLER0.. 로 채운다.
+    """
+    if n_tickers < len(TICKERS):
+        raise ValueError(f"종목 수는 {len(TICKERS)}개 이상이어야 합니다.")
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(f"{START_YEAR}-01-01", f"{START_YEAR + years - 1}-12-31")
+    log_returns = rng.normal(0.0003, 0.012, (len(dates), n_tickers))
+    tickers = (
+        *TICKERS,
+        *[f"FILLER{i}" for i in range(n_tickers - len(TICKERS))],
+    )
+    return PriceMatrix(
+        dates=dates.to_numpy(dtype="datetime64[D]"),
+        tickers=tickers,
+        prices=100 * np.exp(np.cumsum(log_returns, axis=0)),
+    )
+
+
+def make_request(period: int) -> BacktestReq:
+    return BacktestReq(
+        start_year=START_YEAR,
+        start_month=1,
+        initial_investment=10000,
+        trade_date=15,
+        trading_fee=0.001,
+        rebalance_period=period,
+    )
+
+
+def time_call(
+    func: Callable[..., Any],
+    setup: Callable[[], tuple],
+    repeat: int,
+    min_time: float,
+) -> dict[str, Any]:
+    """setup() 이 만든 인자로 func 를 호출하는 시간을 repeat 번 측정
+
+    한 번의 측정은 min_time 초 이상이 되도록 호출 횟수(loops)를 늘리고, setup 시간은 제외한다.
+    """
+    loops = 1
+    while True:
+        elapsed = _run_loops(func, setup, loops)
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / loops]
+    samples += [_run_loops(func, setup, loops) / loops for _ in range(repeat - 1)]
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "min_sec": min(samples),
+        "median_sec": statistics.median(samples),
+    }
+
+
+def _run_loops(
+    func: Callable[..., Any], setup: Callable[[], tuple], loops: int
+) -> float:
+    elapsed = 0.0
+    for _ in range(loops):
+        args = setup()
+        started = time.perf_counter()
+        func(*args)
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def _fresh(price_matrix: PriceMatrix) -> PriceMatrix:
+    """수익률 테이블·달력 캐시가 비어 있는 같은 가격의 행렬 (캐시 없는 첫 요청 측정용)"""
+    return PriceMatrix(
+        dates=price_matrix.dates,
+        tickers=price_matrix.tickers,
+        prices=price_matrix.prices,
+    )
+
+
+def make_universe_strategy(price_matrix: PriceMatrix) -> DualMomentum:
+    """canary·안전자산을 제외한 모든 종목을 후보로 하는 듀얼 모멘텀 (종목 수에 따른 확장성 측정용)"""
+    excluded = (DEFAULT_STRATEGY.canary, DEFAULT_STRATEGY.safe_asset)
+    return DualMomentum(
+        candidates=tuple(t for t in price_matrix.tickers if t not in excluded)
+    )
+
+
+def make_cases(years: int, n_tickers: int, period: int):
+    """(함수 이름, 함수, setup) 목록"""
+    price_matrix = make_price_matrix(years, n_tickers)
+    strategy = make_universe_strategy(price_matrix)
+    req = make_request(period)
+    start = datetime(START_YEAR, 1, 1)
+    end = datetime(START_YEAR + years - 1, 12, 31)
+
+    rows, weights = calculate_rebalance_schedule(
+        start, end, req, price_matrix, strategy
+    )
+    sim = simulate(
+        price_matrix.prices, rows, weights, req.initial_investment, req.trading_fee
+    )
+    nav_days = price_matrix.calendar.days[rows]
+    nav_history = [
+        {"date": str(date), "nav": float(nav)}
+        for date, nav in zip(price_matrix.dates[rows], sim.nav)
+    ]
+
+    cases = [
+        (
+            "calculate_rebalance_schedule",
+            calculate_rebalance_schedule,
+            lambda: (start, end, req, _fresh(price_matrix), strategy),
+        ),
+        (
+            "simulate",
+            simulate,
+            lambda: (
+                price_matrix.prices,
+                rows,
+                weights,
+                req.initial_investment,
+                req.trading_fee,
+            ),
+        ),
+        (
+            "calculate_performance_arrays",
+            calculate_performance_arrays,
+            lambda: (nav_days, sim.nav),
+        ),
+        ("calculate_performance", calculate_performance, lambda: (nav_history,)),
+        (
+            "compute_backtest",
+            compute_backtest,
+            lambda: (_fresh(price_matrix), req, end, strategy),
+        ),
+    ]
+
+    if years <= REFERENCE_MAX_YEARS:
+        df = price_matrix.frame
+        window = df.iloc[-(21 * period + 1) :]
+        rebalance_info = calculate_rebalance_date_and_weights(start, end, req, df)
+        cases += [
+            ("calculate_weights", calculate_weights, lambda: (window, period)),
+            (
+                "calculate_rebalance_date_and_weights",
+                calculate_rebalance_date_and_weights,
+                lambda: (start, end, req, df),
+            ),
+            (
+                "simulate_backtest_loop",
+                simulate_backtest_loop,
+                lambda: (df, rebalance_info, req),
+            ),
+        ]
+    return cases
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results = []
+    for years in args.years:
+        for n_tickers in args.tickers:
+            for period in args.periods:
+                params = {"years": years, "tickers": n_tickers, "period": period}
+                for name, func, setup in make_cases(years, n_tickers, period):
+                    if args.only and name not in args.only:
+                        continue
+                    timing = time_call(func, setup, args.repeat, args.min_time)
+                    key = f"{name}[years={years},tickers={n_tickers},period={period}]"
+                    results.append(
+                        {"key": key, "name": name, "params": params, **timing}
+                    )
+                    print(
+                        f"{key:<80} min {timing['min_sec'] * 1e3:10.3f} ms"
+                        f"  median {timing['median_sec'] * 1e3:10.3f} ms",
+                        file=sys.stderr,
+                    )
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--periods", type=int, nargs="+", default=[1, 3, 12])
+    parser.add_argument("--only", nargs="+", help="실행할 함수 이름")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="측정 1회의 최소 시간(초)"
+    )
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 stdout)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="허용하는 느려짐 비율"
+    )
+    args = parser.parse_args(argv)
+
+    current = run(args)
+    regressions: list[dict[str, Any]] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.threshold)
+        current["regressions"] = [r["key"] for r in regressions]
+
+    text = json.dumps(current, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for result in regressions:
+        print(
+            f"❌ {result['key']}: {result['baseline_min_sec'] * 1e3:.3f} ms → "
+            f"{result['min_sec'] * 1e3:.3f} ms (x{result['ratio']:.2f})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
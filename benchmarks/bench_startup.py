@@ -0,0 +1,161 @@
+"""앱·워커 모듈 import 시간 측정 (python -X importtime 을 새 프로세스에서 반복 실행)
+
+# src.main import 시간과 패키지별 내역을 JSON 으로 저장
+python -m benchmarks.bench_startup --output startup.json
+# 저장해 둔 기준 결과와 비교 (min 기준 20% 넘게 느려지면 종료 코드 1)
+python -m benchmarks.bench_startup --baseline startup.json --threshold 0.2
+# 여러 진입점의 import 시간과 self 시간이 큰 패키지 30개 출력
+python -m benchmarks.bench_startup --modules src.main src.snowball.batch_update_stock --top 30
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import UTC, datetime
+from typing import Any
+
+from benchmarks._common import DUMMY_ENV, compare
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, float, float]]:
+    """-X importtime 출력을 (모듈, 깊이, self 초, cumulative 초) 목록으로 변환"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append(
+            (name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6)
+        )
+    return entries
+
+
+def measure_once(module: str) -> dict[str, Any]:
+    """새 인터프리터에서 module 을 import 한 벽시계 시간과 importtime 내역"""
+    env = {**DUMMY_ENV, **os.environ, "PYTHONPATH": os.getcwd()}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - started
+
+    entries = parse_importtime(proc.stderr)
+    by_package: dict[str, float] = defaultdict(float)
+    for name, _, self_sec, _ in entries:
+        by_package[name.split(".", 1)[0]] += self_sec
+    return {
+        "wall": wall,
+        # 진입 모듈의 cumulative 시간 (자신이 import 한 모든 모듈 포함)
+        "import": next(c for name, _, _, c in entries if name == module),
+        "by_package": by_package,
+    }
+
+
+def _timing(samples: list[float]) -> dict[str, Any]:
+    return {
+        "repeat": len(samples),
+        "min_sec": min(samples),
+        "median_sec": statistics.median(samples),
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results = []
+    for module in args.modules:
+        runs = [measure_once(module) for _ in range(args.repeat)]
+        packages = sorted({p for r in runs for p in r["by_package"]})
+        rows = [
+            (f"{module}[wall]", "wall", [r["wall"] for r in runs]),
+            (f"{module}[import]", "import", [r["import"] for r in runs]),
+            *[
+                (
+                    f"{module}[package={package}]",
+                    "package",
+                    [r["by_package"].get(package, 0.0) for r in runs],
+                )
+                for package in packages
+            ],
+        ]
+        for key, name, samples in rows:
+            results.append(
+                {
+                    "key": key,
+                    "name": name,
+                    "params": {"module": module},
+                    **_timing(samples),
+                }
+            )
+
+        fastest = min(runs, key=lambda r: r["import"])
+        print(
+            f"{module}: import {fastest['import'] * 1e3:.1f} ms"
+            f" (wall {min(r['wall'] for r in runs) * 1e3:.1f} ms)",
+            file=sys.stderr,
+        )
+        heaviest = sorted(fastest["by_package"].items(), key=lambda kv: -kv[1])
+        for package, seconds in heaviest[: args.top]:
+            print(f"  {package:<40} self {seconds * 1e3:8.1f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=["src.main"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="출력할 패키지 수")
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 stdout)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="허용하는 느려짐 비율"
+    )
+    args = parser.parse_args(argv)
+
+    current = run(args)
+    regressions: list[dict[str, Any]] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            # 패키지별 self 시간은 수 ms 단위라 변동이 커서 전체 import·벽시계 시간만 비교
+            totals = {
+                "results": [r for r in current["results"] if r["name"] != "package"]
+            }
+            regressions = compare(totals, json.load(f), args.threshold)
+        current["regressions"] = [r["key"] for r in regressions]
+
+    text = json.dumps(current, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for result in regressions:
+        print(
+            f"❌ {result['key']}: {result['baseline_min_sec'] * 1e3:.3f} ms → "
+            f"{result['min_sec'] * 1e3:.3f} ms (x{result['ratio']:.2f})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,62 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
+    # 실행하는 모든 SQL 을 stdout 에 출력 (디버깅용, 부하 시 비용이 큼)
+    SQL_ECHO: bool = False
+    # 커넥션 풀 설정 (동기·비동기 엔진이 각각 이 크기의 풀을 가짐)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # 쿼리 하나의 최대 실행 시간 (밀리초, None 이면 서버 기본값)
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+
+    # 워커가 요청을 받기 전에 DB 커넥션과 가격 행렬 캐시를 미리 준비
+    STARTUP_WARMUP: bool = True
+
+    # 요청 단위 프로파일링 (켜면 X-Profile: 1 헤더나 ?profile=1 요청을 PROFILING_DIR 에 저장)
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "profiles"
+
+    # 파라미터 스윕 설정
+    SWEEP_MAX_WORKERS: int | None = None  # None 이면 CPU 코어 수
+    SWEEP_MAX_GRID_SIZE: int = 5000
+
+    # 부트스트랩 시뮬레이션 설정 (청크 하나의 경로×거래일×종목 가격 배열이 BOOTSTRAP_CHUNK_MB 를 넘지 않게 나눔)
+    BOOTSTRAP_MAX_WORKERS: int | None = None  # None 이면 CPU 코어 수
+    BOOTSTRAP_MAX_PATHS: int = 10000
+    BOOTSTRAP_CHUNK_MB: int = 64
+
+    # 가격 행렬 스냅샷 디렉터리 (지정하면 가격 저장 후 npy 로 내보내고 워커가 memmap 으로 읽음)
+    PRICE_SNAPSHOT_DIR: str | None = None
+
+    # 동일 요청 결과 캐시 (메모리 LRU 크기, 0 이면 메모리 캐시 사용 안 함)
+    RESULT_CACHE_SIZE: int = 1024
+    # /backtest/{data_id}/rolling 결과 캐시 ((data_id, 요청 해시, window) 단위 LRU 크기)
+    ROLLING_CACHE_SIZE: int = 256
+
+    # nav_history / rebalance_weights 바이너리 zstd 압축 여부 (zstandard 패키지 필요)
+    BACKTEST_BLOB_COMPRESSION: bool = False
+
+    # 비동기 백테스트 작업 큐 (PERSIST 가 True 면 backtest_jobs 테이블에 상태 기록)
+    BACKTEST_JOB_WORKERS: int = 2
+    BACKTEST_JOB_MAX_PENDING: int = 100
+    BACKTEST_JOB_PERSIST: bool = False
+    # 이 시간(초)보다 오래 running 인 작업은 중단된 것으로 보고 재시작 시 다시 실행
+    BACKTEST_JOB_STALE_SECONDS: float = 600.0
+    # 끝난 작업을 메모리에 보관하는 시간(초) (지나면 PERSIST 일 때만 DB 에서 조회 가능)
+    BACKTEST_JOB_RETENTION_SECONDS: float = 3600.0
+
+    # 일별 종가 크롤러 (CRAWL_TICKERS 는 JSON 배열로 지정, 예: '["SPY","QQQ"]')
+    CRAWL_TICKERS: list[str] = ["SPY", "QQQ", "GLD", "TIP", "BIL"]
+    CRAWL_BASE_URL: str = "https://finance.yahoo.com"
+    CRAWL_MAX_WORKERS: int = 4
+    CRAWL_RATE_PER_SEC: float = 0.5
+    CRAWL_BURST: int = 2
+    CRAWL_MAX_RETRIES: int = 3
+    CRAWL_BACKOFF_FACTOR: float = 1.0
+    CRAWL_TIMEOUT: float = 10.0
+    # 크롤링 후 저장된 모든 백테스트를 새 가격까지 이어서 계산할지 여부
+    CRAWL_REFRESH_BACKTESTS: bool = False
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
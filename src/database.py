@@ -1,25 +1,131 @@
-from typing import Generator
+import threading
+from typing import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from src.config import get_setting
+from src.metrics import instrument_engine
 
-settings = get_setting()
+# 엔진은 import 시점이 아닌 첫 사용(또는 lifespan 워밍업) 시점에 만든다.
+# 설정을 읽지 않는 라우트·스크립트와 풀 워커 프로세스는 DB 드라이버를 불러오지 않음
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = threading.Lock()
 
 
-SQLALCHEMY_DATABASE_URL = "postgresql+psycopg2://{}:{}@{}:{}/{}".format(
-    settings.POSTGRES_USER,
-    settings.POSTGRES_PASSWORD,
-    settings.POSTGRES_HOST,
-    settings.POSTGRES_PORT,
-    settings.POSTGRES_DB,
-)
+def get_database_url(driver: str = "psycopg2") -> str:
+    settings = get_setting()
+    return "postgresql+{}://{}:{}@{}:{}/{}".format(
+        driver,
+        settings.POSTGRES_USER,
+        settings.POSTGRES_PASSWORD,
+        settings.POSTGRES_HOST,
+        settings.POSTGRES_PORT,
+        settings.POSTGRES_DB,
+    )
+
+
+def _pool_options() -> dict:
+    settings = get_setting()
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "echo": settings.SQL_ECHO,
+    }
+
+
+def get_engine() -> Engine:
+    """동기(psycopg2) 엔진 (처음 호출할 때 생성)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                timeout = get_setting().DB_STATEMENT_TIMEOUT_MS
+                # statement_timeout 은 커넥션을 만들 때 세션 설정으로 지정
+                connect_args = (
+                    {"options": f"-c statement_timeout={timeout}"}
+                    if timeout is not None
+                    else {}
+                )
+                engine = create_engine(
+                    get_database_url(), connect_args=connect_args, **_pool_options()
+                )
+                instrument_engine(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """읽기 전용 라우트용 비동기(asyncpg) 엔진 (처음 호출할 때 생성)"""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                timeout = get_setting().DB_STATEMENT_TIMEOUT_MS
+                connect_args = (
+                    {"server_settings": {"statement_timeout": str(timeout)}}
+                    if timeout is not None
+                    else {}
+                )
+                engine = create_async_engine(
+                    get_database_url("asyncpg"),
+                    connect_args=connect_args,
+                    **_pool_options(),
+                )
+                instrument_engine(engine.sync_engine)
+                _async_engine = engine
+    return _async_engine
+
+
+async def dispose_engines() -> None:
+    """만들어진 엔진의 커넥션 풀을 모두 닫음"""
+    global _engine, _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True, echo=True)
+def discard_inherited_pools() -> None:
+    """포크된 워커 프로세스의 initializer
 
+    부모 프로세스에서 물려받은 풀의 커넥션(소켓)을 함께 쓰지 않도록 닫지 않고 버린다.
+    """
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class _LazyBindSession(Session):
+    """bind 를 세션 생성 시점이 아닌 쿼리 실행 시점에 엔진에서 가져오는 세션"""
+
+    def get_bind(self, *args, **kwargs):
+        return get_engine()
+
+
+class _LazyAsyncBindSession(Session):
+    """AsyncSession 내부에서 쓰이는 동기 세션 (비동기 엔진의 sync_engine 에 바인딩)"""
+
+    def get_bind(self, *args, **kwargs):
+        return get_async_engine().sync_engine
+
+
+SessionLocal = sessionmaker(class_=_LazyBindSession, autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=_LazyAsyncBindSession, autoflush=False, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
@@ -35,3 +141,12 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
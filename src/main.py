@@ -1,9 +1,35 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.api import api_router
+from src.config import get_setting
+from src.database import dispose_engines
+from src.metrics import HTTP_REQUEST_SECONDS, render_metrics
+from src.profiling import ProfilingMiddleware
+from src.snowball.jobs import job_queue
+from src.startup import record_import_time, warm_up_async, warm_up_sync
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    record_import_time()
+    # 요청을 받기 전에 DB 커넥션과 가격 행렬 캐시를 준비 (첫 요청 지연 방지)
+    if get_setting().STARTUP_WARMUP:
+        await warm_up_async()
+        await run_in_threadpool(warm_up_sync)
+    # 재시작 전에 끝나지 않은 백테스트 작업 복구
+    job_queue.restore_pending()
+    yield
+    job_queue.shutdown()
+    await dispose_engines()
 
-api = FastAPI()
+
+api = FastAPI(lifespan=lifespan)
 
 
 origins = ["*"]
@@ -13,7 +39,40 @@ api.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메서드를 허용하려면 "*"
     allow_headers=["*"],  # 모든 HTTP 헤더를 허용하려면 "*"
+    expose_headers=["X-Profile-Id"],
 )
 
+# 꺼져 있으면 미들웨어를 등록하지 않아 요청마다 추가 비용이 없음
+settings = get_setting()
+if settings.PROFILING_ENABLED:
+    api.add_middleware(ProfilingMiddleware, directory=settings.PROFILING_DIR)
+
+
+@api.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 변수 값이 아닌 라우트 템플릿(/backtest/{data_id})으로 묶어 라벨 수 제한
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status),
+        )
+
+
+@api.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 텍스트 형식의 단계별·쿼리별·라우트별 소요 시간 지표"""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 
 api.include_router(api_router)
@@ -0,0 +1,166 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 초 단위 히스토그램 버킷 (Prometheus 클라이언트 기본값)
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0,
+)  # fmt: skip
+
+
+class Histogram:
+    """라벨 조합별 버킷 카운트·합계·개수를 모으는 Prometheus 형식 히스토그램"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # 라벨 값 → [버킷별 카운트(누적 아님)..., +Inf 카운트], 합계
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = [
+                (labels, list(counts), self._sums[labels])
+                for labels, counts in self._counts.items()
+            ]
+        for labels, counts, total in sorted(items):
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.labelnames, labels)
+            )
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """라벨 조합별 마지막 값을 기록하는 Prometheus 형식 게이지"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            label_text = ",".join(
+                f'{name}="{_escape(label)}"'
+                for name, label in zip(self.labelnames, labels)
+            )
+            lines.append(f"{self.name}{{{label_text}}} {value}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_SECONDS = Histogram(
+    "snowball_stage_seconds",
+    "백테스트 단계별 소요 시간 (초)",
+    ("stage",),
+)
+DB_QUERY_SECONDS = Histogram(
+    "snowball_db_query_seconds",
+    "SQL 문 종류별 실행 시간 (초)",
+    ("statement",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "snowball_http_request_seconds",
+    "라우트별 HTTP 요청 처리 시간 (초)",
+    ("method", "route", "status"),
+)
+STARTUP_SECONDS = Gauge(
+    "snowball_startup_seconds",
+    "워커 시작 단계별 소요 시간 (초)",
+    ("phase",),
+)
+REGISTRY = (STAGE_SECONDS, DB_QUERY_SECONDS, HTTP_REQUEST_SECONDS, STARTUP_SECONDS)
+
+
+def stage_timer(stage: str):
+    """with stage_timer("simulate"): ... 구간의 소요 시간을 snowball_stage_seconds 에 기록"""
+    return STAGE_SECONDS.time(stage)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """engine 에서 실행되는 SQL 의 실행 시간을 문 종류(SELECT/INSERT/...) 별로 기록"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        # 라벨 수가 늘어나지 않도록 SQL 전체가 아닌 첫 키워드만 사용
+        kind = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, kind)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # 실패한 쿼리는 after_cursor_execute 가 호출되지 않으므로 시작 시각만 정리
+        if context.connection is not None:
+            stack = context.connection.info.get("query_started")
+            if stack:
+                stack.pop()
+
+
+def render_metrics() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 변환"""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
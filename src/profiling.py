@@ -0,0 +1,70 @@
+import cProfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+def _wants_profile(scope) -> bool:
+    """X-Profile: 1 헤더나 ?profile=1 쿼리로 프로파일링을 요청했는지 확인"""
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value not in (b"", b"0", b"false")
+    query = scope.get("query_string", b"")
+    return b"profile=" in query and parse_qs(query.decode()).get("profile") == ["1"]
+
+
+class ProfilingMiddleware:
+    """요청한 HTTP 요청만 cProfile 로 감싸 DIRECTORY/<id>.prof (pstats) 로 저장하는 ASGI 미들웨어
+
+    - 응답 헤더 X-Profile-Id 로 저장한 프로파일 id 를 돌려준다.
+    - Python 3.12 부터 cProfile 은 인터프리터 전역(sys.monitoring)으로 동작해
+      스레드풀에서 실행되는 동기 라우트도 함께 측정되며, 한 번에 하나만 켤 수 있다.
+      그래서 이미 다른 요청을 프로파일링 중이면 프로파일 없이 그대로 처리한다.
+    """
+
+    def __init__(self, app, directory: str):
+        self.app = app
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid4().hex[:12]}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (PROFILE_ID_HEADER, profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+        finally:
+            self._lock.release()
+        # 응답 본문 전송이 끝난 뒤 저장 (python -m pstats / snakeviz 로 확인)
+        profiler.dump_stats(self.directory / f"{profile_id}.prof")
+        print(
+            f"🔍 프로파일 저장: {scope['method']} {scope['path']} → {profile_id}.prof"
+        )
@@ -1,42 +1,109 @@
-import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, date, datetime
-from typing import Optional, Tuple
-
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from src.config import get_setting
 from src.database import SessionLocal
-from src.snowball.models import Stock
+from src.snowball.flows import refresh_stored_backtests
+from src.snowball.prices import invalidate_price_cache, refresh_price_snapshot
+from src.snowball.service import upsert_stock_prices
+from src.snowball.strategies import DEFAULT_STRATEGY
 
-# ✅ 크롤링 대상 종목
-TICKERS = ["SPY", "QQQ", "GLD", "BIL"]
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
 
 # ✅ User-Agent 설정
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.0.0 Safari/537.36"
 }
+# 잠시 뒤 다시 요청하면 성공할 수 있는 응답 코드
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰이 최대 capacity 개까지 쌓이는 요청 속도 제한기"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size: int):
+    """keep-alive 연결을 재사용하는 세션 (재시도는 속도 제한을 지키도록 fetch_html 에서 처리)"""
+    # HTTP·HTML 파싱 라이브러리는 크롤링할 때만 불러옴 (run_batch 등을 import 하는 쪽의 시작 시간 단축)
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 # ✅ HTML 요청 함수
-def fetch_html(url: str) -> Optional[BeautifulSoup]:
-    """야후 파이낸스에서 HTML 데이터를 가져와 BeautifulSoup 객체로 반환"""
-    try:
-        time.sleep(random.uniform(1, 3))  # 랜덤 딜레이 (429 방지)
-        response = requests.get(url, headers=HEADERS)
-
-        if response.status_code == 200:
-            return BeautifulSoup(response.text, "html.parser")
+def fetch_html(
+    url: str,
+    session: "requests.Session",
+    timeout: float,
+    bucket: TokenBucket,
+    max_retries: int,
+    backoff_factor: float,
+) -> Optional["BeautifulSoup"]:
+    """야후 파이낸스에서 HTML 데이터를 가져와 BeautifulSoup 객체로 반환
+
+    429/5xx·연결 오류는 최대 max_retries 번 지수 백오프(Retry-After 우선)로 재시도하며,
+    재시도를 포함한 모든 요청은 보내기 전에 bucket 의 토큰을 하나씩 얻는다.
+    """
+    import requests
+    from bs4 import BeautifulSoup
+
+    for attempt in range(max_retries + 1):
+        delay = backoff_factor * 2**attempt
+        bucket.acquire()
+        try:
+            response = session.get(url, timeout=timeout)
+        except requests.RequestException as e:
+            print(f"❌ 요청 중 오류 발생: {e}")
         else:
+            if response.status_code == 200:
+                return BeautifulSoup(response.text, "html.parser")
             print(f"⚠️ 요청 실패: {response.status_code}")
-            return None
-    except requests.RequestException as e:
-        print(f"❌ 요청 중 오류 발생: {e}")
-        return None
+            if response.status_code not in RETRY_STATUSES:
+                return None
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
+
+        if attempt < max_retries:
+            time.sleep(delay)
+    return None
 
 
 # ✅ HTML에서 최신 종가 데이터 파싱 함수
-def parse_latest_stock_data(soup: BeautifulSoup) -> Optional[Tuple[date, float]]:
+def parse_latest_stock_data(soup: "BeautifulSoup") -> Optional[Tuple[date, float]]:
     """HTML에서 최신 날짜 및 Adjusted Close 값을 추출"""
     table_rows = soup.select("table tbody tr")
 
@@ -58,42 +125,100 @@ def parse_latest_stock_data(soup: BeautifulSoup) -> Optional[Tuple[date, float]]
     return None
 
 
-# ✅ 배치 실행 함수
-def run_batch():
-    print(f"📌 ETF 가격 업데이트 시작: {datetime.now(UTC)}")
+def crawl_latest_prices(
+    tickers: list[str], base_url: str
+) -> dict[str, Optional[Tuple[date, float]]]:
+    """종목별 최신 종가를 속도 제한 하에서 동시에 수집 (실패한 종목은 None)"""
+    settings = get_setting()
+    bucket = TokenBucket(settings.CRAWL_RATE_PER_SEC, settings.CRAWL_BURST)
+    session = make_session(pool_size=settings.CRAWL_MAX_WORKERS)
+
+    def crawl(ticker: str) -> Optional[Tuple[date, float]]:
+        soup = fetch_html(
+            f"{base_url}/quote/{ticker}/history",
+            session,
+            timeout=settings.CRAWL_TIMEOUT,
+            bucket=bucket,
+            max_retries=settings.CRAWL_MAX_RETRIES,
+            backoff_factor=settings.CRAWL_BACKOFF_FACTOR,
+        )
+        if not soup:
+            print(f"❌ {ticker} 데이터 가져오기 실패, 스킵")
+            return None
 
-    db = SessionLocal()
+        stock_data = parse_latest_stock_data(soup)
+        if not stock_data:
+            print(f"❌ {ticker} Adjusted Close 값 파싱 실패, 스킵")
+        return stock_data
 
-    try:
-        for ticker in TICKERS:
-            url = f"https://finance.yahoo.com/quote/{ticker}/history"
-            soup = fetch_html(url)
+    with session, ThreadPoolExecutor(max_workers=settings.CRAWL_MAX_WORKERS) as pool:
+        return dict(zip(tickers, pool.map(crawl, tickers)))
 
-            if not soup:
-                print(f"❌ {ticker} 데이터 가져오기 실패, 스킵")
-                break
 
-            stock_data = parse_latest_stock_data(soup)
+# ✅ 배치 실행 함수
+def run_batch(
+    tickers: list[str] | None = None,
+    base_url: str | None = None,
+    refresh_backtests: bool | None = None,
+) -> dict:
+    settings = get_setting()
+    tickers = tickers or settings.CRAWL_TICKERS
+    base_url = base_url or settings.CRAWL_BASE_URL
+    if refresh_backtests is None:
+        refresh_backtests = settings.CRAWL_REFRESH_BACKTESTS
+    print(f"📌 ETF 가격 업데이트 시작: {datetime.now(UTC)}")
 
-            if not stock_data:
-                print(f"❌ {ticker} Adjusted Close 값 파싱 실패, 스킵")
-                break
+    # ✅ 일부 종목이 실패해도 나머지 종목은 저장
+    rows, failed = [], []
+    for ticker, stock_data in crawl_latest_prices(tickers, base_url).items():
+        if stock_data is None:
+            failed.append(ticker)
+            continue
+        latest_date, adj_close = stock_data
+        rows.append({"date": latest_date, "ticker": ticker, "price": adj_close})
 
-            latest_date, adj_close = stock_data
-            stock_entry = Stock(date=latest_date, ticker=ticker, price=adj_close)
-            db.merge(stock_entry)
-            print(f"✅ {ticker} 저장 완료: {latest_date} - ${adj_close}")
+    db = SessionLocal()
 
-        db.commit()
-        print("✅ 모든 종목 업데이트 완료.")
+    try:
+        if rows:
+            upsert_stock_prices(db, rows)
+            db.commit()
+            invalidate_price_cache()
+            refresh_price_snapshot(db, DEFAULT_STRATEGY.tickers)
+        for row in rows:
+            print(f"✅ {row['ticker']} 저장 완료: {row['date']} - ${row['price']}")
+        print(f"✅ 종목 업데이트 완료 (성공 {len(rows)}, 실패 {len(failed)}).")
 
     except Exception as e:
         db.rollback()
         print(f"❌ 데이터 저장 중 오류 발생: {e}")
+        rows, failed = [], list(tickers)
 
     finally:
         db.close()
 
+    # ✅ 저장된 백테스트를 새 가격까지 이어서 계산 (실패해도 저장한 가격은 유지)
+    refreshed = None
+    if rows and refresh_backtests:
+        db = SessionLocal()
+        try:
+            refreshed = refresh_stored_backtests(db)
+            print(
+                f"✅ 백테스트 갱신 완료 (갱신 {refreshed['extended']}, "
+                f"변경 없음 {refreshed['unchanged']}, 실패 {refreshed['failed']})."
+            )
+        except Exception as e:
+            db.rollback()
+            print(f"❌ 백테스트 갱신 중 오류 발생: {e}")
+        finally:
+            db.close()
+
+    return {
+        "updated": [row["ticker"] for row in rows],
+        "failed": failed,
+        "refreshed": refreshed,
+    }
+
 
 if __name__ == "__main__":
     run_batch()
@@ -0,0 +1,276 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.config import get_setting
+from src.snowball.codec import decode_series, to_epoch_days
+from src.snowball.compare import calculate_performance_batch
+from src.snowball.engine import simulate_paths
+from src.snowball.flows import METRICS, stored_backtest_req
+from src.snowball.prices import get_price_matrix
+from src.snowball.schema import BacktestBootstrapReq
+from src.snowball.service import get_backtest_result_by_id
+from src.snowball.strategies import DEFAULT_STRATEGY, Strategy
+
+
+@dataclass(frozen=True)
+class BootstrapContext:
+    """모든 경로가 공유하는 입력 (워커 프로세스에 한 번만 전달)
+
+    경로의 행 0 은 백테스트 시작일이며, rows 도 이 기준의 리밸런싱 행 번호다.
+    """
+
+    dates: np.ndarray  # (N,) 경로의 거래일
+    tickers: tuple[str, ...]
+    start_prices: np.ndarray  # (T,) 시작일 실제 가격
+    # (N - 1, T) 실제 일별 로그 수익률 (종목 간 상관을 유지하도록 행 단위로 추출)
+    log_returns: np.ndarray
+    rows: np.ndarray  # (K,)
+    rebalance_period: int
+    initial_investment: float
+    trading_fee: float
+    nav_frequency: str
+    block_size: int
+    strategy: Strategy
+
+
+def block_bootstrap_indices(
+    n_returns: int, block_size: int, seeds: list[np.random.SeedSequence]
+) -> np.ndarray:
+    """경로마다 원형 블록 부트스트랩으로 뽑은 수익률 행 번호 (P, n_returns)
+
+    블록 시작점은 경로별 시드로 뽑으므로 경로를 어떻게 청크로 나눠도 결과가 같다.
+    """
+    block_size = min(block_size, n_returns)
+    n_blocks = math.ceil(n_returns / block_size)
+    starts = np.stack(
+        [np.random.default_rng(seed).integers(0, n_returns, n_blocks) for seed in seeds]
+    )
+    # 끝을 넘어가는 블록은 처음으로 이어 붙임 (원형) → 모든 행이 같은 확률로 뽑힘
+    indices = (starts[:, :, None] + np.arange(block_size)) % n_returns
+    return indices.reshape(len(seeds), -1)[:, :n_returns]
+
+
+def synthetic_prices(context: BootstrapContext, indices: np.ndarray) -> np.ndarray:
+    """수익률 행 번호 (P, N - 1) 로 만든 가격 경로 (P, N, T) (배열 하나에서 제자리 계산)"""
+    n_paths = len(indices)
+    paths = np.empty((n_paths, len(context.dates), len(context.tickers)))
+    # 시작 가격도 로그로 넣어 누적합 → exp 한 번으로 가격을 만듦
+    paths[:, 0] = np.log(context.start_prices)
+    np.take(context.log_returns, indices, axis=0, out=paths[:, 1:], mode="clip")
+    np.cumsum(paths, axis=1, out=paths)
+    np.exp(paths, out=paths)
+    return paths
+
+
+def simulate_path_metrics(
+    context: BootstrapContext, indices: np.ndarray
+) -> dict[str, np.ndarray]:
+    """경로마다 전략 비중·수수료 모델로 백테스트를 다시 실행한 통계값 (지표 → (P,))"""
+    paths = synthetic_prices(context, indices)
+    weights = context.strategy.path_weights(
+        context.dates,
+        context.tickers,
+        paths,
+        context.rows,
+        context.rebalance_period,
+        0,
+    )
+    result = simulate_paths(
+        paths,
+        context.rows,
+        weights,
+        context.initial_investment,
+        context.trading_fee,
+    )
+
+    # 저장된 백테스트와 같은 주기의 NAV 로 통계값 계산 (compute_backtest 의 make_nav_series 와 같은 정의)
+    if context.nav_frequency == "daily":
+        nav_rows = np.arange(context.rows[0], len(context.dates))
+        segments = np.searchsorted(context.rows, nav_rows, "right") - 1
+        nav = result.cash[:, segments] + np.einsum(
+            "pnt,pnt->pn", result.holdings[:, segments], paths[:, nav_rows]
+        )
+    else:
+        nav_rows = context.rows
+        nav = result.nav
+
+    # 경로(행)별 합산이 항상 같은 순서로 이뤄지도록 C 순서로 맞춤 (청크 크기와 무관하게 같은 결과)
+    nav = np.ascontiguousarray(nav)
+    days = np.broadcast_to(
+        to_epoch_days(context.dates[nav_rows]).astype(np.float64), nav.shape
+    )
+    lengths = np.full(len(nav), nav.shape[1])
+    return calculate_performance_batch(days, nav, lengths)
+
+
+def path_nbytes(context: BootstrapContext) -> int:
+    """경로 하나를 계산하는 동안 동시에 잡히는 배열 크기 합 (청크 크기 계산용)"""
+    n_dates, n_tickers = len(context.dates), len(context.tickers)
+    if context.nav_frequency == "daily":
+        # 가격 경로 (N, T) + 일별로 펼친 보유 수량·가격 (N, T) 2개 + 비중·보유 수량 (K, T)
+        cells = 3 * n_dates * n_tickers + 2 * len(context.rows) * n_tickers
+    else:
+        # 가격 경로 (N, T) + 제자리 누적합이 겹치는 메모리라 numpy 가 만드는 임시 복사본 (N, T)
+        cells = 2 * n_dates * n_tickers
+    # 블록 행 번호·NAV·수익률·낙폭 등 거래일 길이 (N,) 배열
+    cells += 4 * n_dates
+    return cells * 8
+
+
+# 워커 프로세스가 시작될 때 한 번만 전달받는 입력
+_worker_context: BootstrapContext | None = None
+
+
+def _init_worker(context: BootstrapContext) -> None:
+    global _worker_context
+    _worker_context = context
+
+
+def _run_paths(
+    context: BootstrapContext, seed: int, path_start: int, path_stop: int
+) -> dict[str, np.ndarray]:
+    # i 번째 경로의 시드는 SeedSequence(seed).spawn() 의 i 번째 자식과 같음
+    seeds = [
+        np.random.SeedSequence(seed, spawn_key=(i,))
+        for i in range(path_start, path_stop)
+    ]
+    indices = block_bootstrap_indices(
+        len(context.log_returns), context.block_size, seeds
+    )
+    return simulate_path_metrics(context, indices)
+
+
+def _run_chunk(seed: int, path_start: int, path_stop: int) -> dict[str, np.ndarray]:
+    assert _worker_context is not None
+    return _run_paths(_worker_context, seed, path_start, path_stop)
+
+
+def run_paths(
+    context: BootstrapContext,
+    n_paths: int,
+    seed: int,
+    chunk_bytes: int,
+    max_workers: int | None = None,
+) -> dict[str, np.ndarray]:
+    """n_paths 개 경로를 메모리 한도 내의 청크로 나눠 프로세스 풀에서 계산 (경로 순서대로 지표 반환)"""
+    path_bytes = path_nbytes(context)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, n_paths))
+    # 메모리 한도를 넘지 않으면서 워커마다 최소 한 청크는 돌아가도록
+    chunk_paths = max(1, min(chunk_bytes // path_bytes, math.ceil(n_paths / workers)))
+    bounds = [
+        (start, min(start + chunk_paths, n_paths))
+        for start in range(0, n_paths, chunk_paths)
+    ]
+
+    if workers <= 1 or len(bounds) == 1:
+        chunks = [_run_paths(context, seed, start, stop) for start, stop in bounds]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(bounds)),
+            initializer=_init_worker,
+            initargs=(context,),
+        ) as executor:
+            futures = [
+                executor.submit(_run_chunk, seed, start, stop) for start, stop in bounds
+            ]
+            chunks = [future.result() for future in futures]
+
+    return {
+        metric: np.concatenate([chunk[metric] for chunk in chunks])
+        for metric in METRICS
+    }
+
+
+def make_bootstrap_context(
+    price_matrix, stored, block_size: int, strategy: Strategy = DEFAULT_STRATEGY
+) -> BootstrapContext:
+    """저장된 백테스트의 기간(시작월 ~ 마지막 NAV 날짜)으로 부트스트랩 입력을 만듦"""
+    backtest_req = stored_backtest_req(stored)
+    start_date = datetime(backtest_req.start_year, backtest_req.start_month, 1)
+    end_date = decode_series(stored.nav_history, columns=["nav"]).dates[-1].item()
+
+    calendar = price_matrix.calendar
+    first_row = calendar.first_on_or_after(start_date)
+    end_row = calendar.last_on_or_before(end_date)
+    rows = calendar.rebalance_rows(
+        start_date, end_date, backtest_req.trade_date, backtest_req.rebalance_period
+    )
+    if len(rows) < 2:
+        raise ValueError(
+            "리밸런싱이 2회 미만이라 통계값을 계산할 수 없는 백테스트입니다."
+        )
+
+    prices = np.asarray(price_matrix.prices[first_row : end_row + 1])
+    return BootstrapContext(
+        dates=price_matrix.dates[first_row : end_row + 1],
+        tickers=price_matrix.tickers,
+        start_prices=prices[0].copy(),
+        log_returns=np.diff(np.log(prices), axis=0),
+        rows=np.asarray(rows) - first_row,
+        rebalance_period=backtest_req.rebalance_period,
+        initial_investment=backtest_req.initial_investment,
+        trading_fee=backtest_req.trading_fee,
+        nav_frequency=backtest_req.nav_frequency,
+        block_size=block_size,
+        strategy=strategy,
+    )
+
+
+def _percentiles(values: np.ndarray, q: list[float]) -> list[float | None]:
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return [None] * len(q)
+    return np.percentile(finite, q).tolist()
+
+
+def run_backtest_bootstrap(
+    db: Session, data_id: int, bootstrap_req: BacktestBootstrapReq
+) -> dict[str, Any] | None:
+    """저장된 백테스트의 일별 수익률을 블록 부트스트랩한 경로들로 전략을 다시 실행해 지표 분포 반환
+
+    저장 결과가 없으면 None, 경로 수가 최대값을 넘거나 계산할 수 없는 백테스트면 ValueError
+    """
+    settings = get_setting()
+    if bootstrap_req.n_paths > settings.BOOTSTRAP_MAX_PATHS:
+        raise ValueError(
+            f"경로 수({bootstrap_req.n_paths})가 최대값({settings.BOOTSTRAP_MAX_PATHS})을 초과합니다."
+        )
+    stored = get_backtest_result_by_id(db, data_id)
+    if stored is None:
+        return None
+
+    price_matrix = get_price_matrix(db, DEFAULT_STRATEGY.tickers)
+    context = make_bootstrap_context(price_matrix, stored, bootstrap_req.block_size)
+    # 시드를 지정하지 않으면 새로 만들어 응답에 포함 (같은 시드로 다시 요청하면 같은 결과)
+    seed = (
+        bootstrap_req.seed
+        if bootstrap_req.seed is not None
+        else int(np.random.default_rng().integers(2**53))
+    )
+    metrics = run_paths(
+        context,
+        bootstrap_req.n_paths,
+        seed,
+        chunk_bytes=settings.BOOTSTRAP_CHUNK_MB * 1024 * 1024,
+        max_workers=settings.BOOTSTRAP_MAX_WORKERS,
+    )
+
+    return {
+        "data_id": data_id,
+        "n_paths": bootstrap_req.n_paths,
+        "block_size": bootstrap_req.block_size,
+        "seed": seed,
+        "percentiles": bootstrap_req.percentiles,
+        "historical": {metric: getattr(stored, metric) for metric in METRICS},
+        "distribution": {
+            metric: _percentiles(values, bootstrap_req.percentiles)
+            for metric, values in metrics.items()
+        },
+    }
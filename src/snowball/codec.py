@@ -0,0 +1,145 @@
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축은 선택 사항
+    zstandard = None
+
+# 헤더: magic, 버전, 플래그, 예약, 행 수, 열 수, 열 이름 바이트 수
+_HEADER = struct.Struct("<4sBBHIII")
+_MAGIC = b"SNBT"
+_VERSION = 1
+_FLAG_ZSTD = 0x01
+# 날짜를 첫 날(int32) + 이후 간격(uint16) 으로 저장 (일별 시계열에서 날짜 크기를 절반으로)
+_FLAG_DAY_DELTAS = 0x02
+
+
+@dataclass(frozen=True)
+class SeriesTable:
+    """epoch-day(int32) 날짜 축과 float64 열들로 이루어진 시계열"""
+
+    days: np.ndarray  # (N,) int32, 1970-01-01 기준 일수
+    columns: tuple[str, ...]
+    values: np.ndarray  # (N, C) float64
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.days.astype("datetime64[D]")
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.columns.index(name)]
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+def to_epoch_days(dates) -> np.ndarray:
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int32)
+
+
+def _pad(size: int) -> int:
+    """8 바이트 정렬을 위한 패딩 길이"""
+    return -size % 8
+
+
+def _encode_days(days: np.ndarray) -> tuple[bytes, int]:
+    """날짜 열 바이트와 플래그 (간격이 모두 0~65535 일이면 간격 형식 사용)"""
+    days = np.asarray(days, dtype=np.int64)
+    deltas = np.diff(days)
+    if len(days) > 1 and deltas.min() >= 0 and deltas.max() <= np.iinfo(np.uint16).max:
+        return (
+            days[:1].astype("<i4").tobytes() + deltas.astype("<u2").tobytes(),
+            _FLAG_DAY_DELTAS,
+        )
+    return days.astype("<i4").tobytes(), 0
+
+
+def encode_series(table: SeriesTable, compress: bool = False) -> bytes:
+    """SeriesTable 을 열 단위(column-major) 바이너리로 인코딩"""
+    n_rows = len(table.days)
+    names = "\n".join(table.columns).encode()
+    day_bytes, flags = _encode_days(table.days)
+    body = b"".join(
+        [
+            names,
+            b"\0" * _pad(_HEADER.size + len(names)),
+            day_bytes,
+            b"\0" * _pad(len(day_bytes)),
+            # 열마다 연속된 메모리로 저장해 필요한 열만 읽을 수 있게 함
+            np.asarray(table.values, dtype="<f8")
+            .reshape(n_rows, len(table.columns))
+            .T.tobytes(),
+        ]
+    )
+
+    if compress:
+        if zstandard is None:
+            raise RuntimeError("zstd 압축을 사용하려면 zstandard 패키지가 필요합니다.")
+        body = zstandard.ZstdCompressor().compress(body)
+        flags |= _FLAG_ZSTD
+
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, flags, 0, n_rows, len(table.columns), len(names)
+    )
+    return header + body
+
+
+def decode_series(blob: bytes, columns: list[str] | None = None) -> SeriesTable:
+    """바이너리를 SeriesTable 로 디코딩
+
+    압축되지 않은 경우 값 열은 np.frombuffer 로 복사 없이 읽고, columns 를 지정하면 해당 열만 읽는다.
+    """
+    magic, version, flags, _, n_rows, n_cols, names_len = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("지원하지 않는 시계열 바이너리 형식입니다.")
+
+    buffer = memoryview(blob)
+    offset = _HEADER.size
+    if flags & _FLAG_ZSTD:
+        if zstandard is None:
+            raise RuntimeError(
+                "zstd 로 압축된 데이터를 읽으려면 zstandard 패키지가 필요합니다."
+            )
+        # 압축 해제 후에도 헤더 기준 오프셋이 같도록 헤더 자리를 비워둠
+        body = zstandard.ZstdDecompressor().decompress(buffer[offset:].tobytes())
+        buffer = memoryview(b"\0" * offset + body)
+
+    names = bytes(buffer[offset : offset + names_len]).decode()
+    all_columns = tuple(names.split("\n")) if n_cols else ()
+    offset += names_len + _pad(offset + names_len)
+
+    if flags & _FLAG_DAY_DELTAS:
+        first = np.frombuffer(buffer, dtype="<i4", count=1, offset=offset)
+        deltas = np.frombuffer(buffer, dtype="<u2", count=n_rows - 1, offset=offset + 4)
+        days = np.empty(n_rows, dtype=np.int32)
+        days[0] = first[0]
+        np.cumsum(deltas, out=days[1:])
+        days[1:] += first[0]
+        day_size = 4 + 2 * (n_rows - 1)
+    else:
+        days = np.frombuffer(buffer, dtype="<i4", count=n_rows, offset=offset)
+        day_size = 4 * n_rows
+    offset += day_size + _pad(day_size)
+
+    if columns is None or tuple(columns) == all_columns:
+        # 전체 열: (C, N) 버퍼를 전치한 view 로 반환 (복사 없음)
+        values = (
+            np.frombuffer(buffer, dtype="<f8", count=n_rows * n_cols, offset=offset)
+            .reshape(n_cols, n_rows)
+            .T
+        )
+        return SeriesTable(days=days, columns=all_columns, values=values)
+
+    # 일부 열: 해당 열의 바이트만 읽음
+    values = np.empty((n_rows, len(columns)))
+    for i, name in enumerate(columns):
+        values[:, i] = np.frombuffer(
+            buffer,
+            dtype="<f8",
+            count=n_rows,
+            offset=offset + 8 * n_rows * all_columns.index(name),
+        )
+    return SeriesTable(days=days, columns=tuple(columns), values=values)
@@ -0,0 +1,113 @@
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.snowball.codec import decode_series
+from src.snowball.rolling import DAYS_PER_YEAR, TRADING_DAYS
+from src.snowball.service import get_backtest_navs_by_ids
+
+INPUT_COLUMNS = (
+    "start_year",
+    "start_month",
+    "initial_investment",
+    "trade_date",
+    "trading_fee",
+    "rebalance_period",
+    "nav_frequency",
+)
+
+
+def pad_series(
+    values: list[np.ndarray], fill: float = np.nan
+) -> tuple[np.ndarray, np.ndarray]:
+    """길이가 다른 1차원 배열들을 뒤쪽을 fill 로 채운 (개수, 최대 길이) 행렬로 쌓고 길이 배열과 함께 반환"""
+    lengths = np.array([len(v) for v in values], dtype=np.int64)
+    out = np.full((len(values), max(lengths.max(initial=0), 1)), fill, dtype=np.float64)
+    # 행 순서대로 이어 붙인 값을 유효한 칸에 한 번에 채움
+    mask = np.arange(out.shape[1]) < lengths[:, None]
+    if mask.any():
+        out[mask] = np.concatenate(values)
+    return out, lengths
+
+
+def calculate_performance_batch(
+    days: np.ndarray,
+    nav: np.ndarray,
+    lengths: np.ndarray,
+    risk_free_rate: float = 0.02,
+) -> dict[str, np.ndarray]:
+    """뒤쪽이 NaN 으로 채워진 (실행 수, 길이) NAV 행렬의 통계값을 행마다 한 번에 계산
+
+    calculate_performance_arrays 와 같은 정의이며, 계산할 수 없는 값(시점 1개 이하 등)은 NaN
+    """
+    last = np.maximum(lengths - 1, 0)
+    rows = np.arange(len(lengths))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = nav[rows, last] / nav[:, 0]
+        total_return = growth - 1
+        num_years = (days[rows, last] - days[:, 0]) / DAYS_PER_YEAR
+        cagr = np.where(num_years > 0, growth ** (1 / num_years) - 1, np.nan)
+
+        # 패딩 구간의 수익률은 NaN 이므로 nansum 으로 유효 구간만 합산
+        returns = nav[:, 1:] / nav[:, :-1] - 1
+        count = last
+        mean = np.nansum(returns, axis=1) / count
+        squares = np.nansum((returns - mean[:, None]) ** 2, axis=1)
+        # pandas std 와 같이 표본 표준편차 (수익률이 2개 미만이면 NaN)
+        vol = np.where(
+            count > 1, np.sqrt(squares / (count - 1)) * np.sqrt(TRADING_DAYS), np.nan
+        )
+        sharpe = np.where(vol != 0, (cagr - risk_free_rate) / vol, np.nan)
+
+        # 패딩은 뒤쪽에만 있으므로 누적 최고점은 유효 구간에서 그대로 맞고, fmin 은 NaN 을 건너뜀
+        drawdown = nav / np.fmax.accumulate(nav, axis=1) - 1
+        mdd = np.fmin.reduce(drawdown, axis=1)
+
+    return {
+        "total_return": total_return,
+        "cagr": cagr,
+        "vol": vol,
+        "sharpe": sharpe,
+        "mdd": mdd,
+    }
+
+
+def _calculate_rows_performance(
+    blobs: list[bytes], risk_free_rate: float
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    series = [decode_series(blob, columns=["nav"]) for blob in blobs]
+    nav, lengths = pad_series([s.column("nav") for s in series])
+    days, _ = pad_series([s.days.astype(np.float64) for s in series])
+    return lengths, calculate_performance_batch(days, nav, lengths, risk_free_rate)
+
+
+def _to_optional(values: np.ndarray) -> list[float | None]:
+    return [value if np.isfinite(value) else None for value in values.tolist()]
+
+
+async def compare_backtests(
+    db: AsyncSession, data_ids: list[int], risk_free_rate: float = 0.02
+) -> dict:
+    """여러 data_id 의 입력값과 통계값을 열 단위 표로 반환 (없는 data_id 는 missing 에 모음)
+
+    NAV 시계열은 한 번의 쿼리로 읽고, 길이가 다른 시계열은 패딩한 행렬로 한 번에 계산한다.
+    """
+    rows_by_id = {
+        row.data_id: row for row in await get_backtest_navs_by_ids(db, data_ids)
+    }
+    found = [data_id for data_id in data_ids if data_id in rows_by_id]
+    rows = [rows_by_id[data_id] for data_id in found]
+
+    # 디코딩·통계 계산은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    lengths, metrics = await run_in_threadpool(
+        _calculate_rows_performance, [row.nav_history for row in rows], risk_free_rate
+    )
+
+    return {
+        "data_id": found,
+        **{column: [getattr(row, column) for row in rows] for column in INPUT_COLUMNS},
+        "nav_points": lengths.tolist(),
+        **{name: _to_optional(values) for name, values in metrics.items()},
+        "missing": [data_id for data_id in data_ids if data_id not in rows_by_id],
+    }
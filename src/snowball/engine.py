@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """리밸런싱 시점별 시뮬레이션 결과 (K = 리밸런싱 횟수, T = 종목 수)"""
+
+    nav: np.ndarray  # (K,) 리밸런싱 직후 NAV
+    holdings: np.ndarray  # (K, T) 리밸런싱 직후 보유 수량
+    cash: np.ndarray  # (K,) 리밸런싱 직후 현금
+    fees: np.ndarray  # (K,) 리밸런싱 시 발생한 수수료
+
+
+def simulate(
+    prices: np.ndarray,
+    rebalance_rows: np.ndarray,
+    weights: np.ndarray,
+    initial_investment: float,
+    trading_fee: float,
+    initial_holdings: np.ndarray | None = None,
+) -> SimulationResult:
+    """가격 행렬(날짜×종목)과 리밸런싱 스케줄로 보유량, 수수료, 현금, NAV 계산
+
+    - prices: (N, T) float64 가격 행렬
+    - rebalance_rows: (K,) 리밸런싱이 일어나는 prices 의 행 번호 (오름차순)
+    - weights: (K, T) 리밸런싱 시점별 목표 비중
+    - initial_holdings: (T,) 시작 보유 수량 (저장된 결과를 이어서 계산할 때, initial_investment 는 시작 현금)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    rows = np.asarray(rebalance_rows, dtype=np.intp)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # 리밸런싱 시점의 가격만 한 번에 추출
+    rebalance_prices = prices[rows]
+    n_rebalance, n_tickers = rebalance_prices.shape
+
+    holdings = np.zeros((n_rebalance, n_tickers))
+    cash = np.empty(n_rebalance)
+    fees = np.empty(n_rebalance)
+
+    # 직전 리밸런싱의 현금에 의존하므로 리밸런싱 횟수(K)만큼만 순회 (종목 차원은 벡터 연산)
+    previous_holdings = (
+        np.zeros(n_tickers)
+        if initial_holdings is None
+        else np.asarray(initial_holdings, dtype=np.float64)
+    )
+    current_cash = float(initial_investment)
+    for k in range(n_rebalance):
+        row_prices = rebalance_prices[k]
+        total_value = current_cash + previous_holdings @ row_prices
+
+        new_holdings = (total_value * weights[k]) / row_prices
+        # ✅ 매수/매도 모두 같은 수수료율이므로 매매 금액 합계에 한 번에 적용
+        fee = (
+            np.abs(new_holdings - previous_holdings) * row_prices
+        ).sum() * trading_fee
+
+        current_cash = total_value - new_holdings @ row_prices - fee
+
+        holdings[k] = new_holdings
+        cash[k] = current_cash
+        fees[k] = fee
+        previous_holdings = new_holdings
+
+    nav = cash + np.einsum("kt,kt->k", holdings, rebalance_prices)
+    return SimulationResult(nav=nav, holdings=holdings, cash=cash, fees=fees)
+
+
+def simulate_paths(
+    prices: np.ndarray,
+    rebalance_rows: np.ndarray,
+    weights: np.ndarray,
+    initial_investment: float,
+    trading_fee: float,
+) -> SimulationResult:
+    """simulate 를 같은 리밸런싱 스케줄의 가격 경로 여러 개에 대해 한 번에 계산
+
+    - prices: (P, N, T) 경로별 가격 행렬, weights: (P, K, T) 경로별 목표 비중
+    - 결과 배열은 모두 경로 차원 P 가 앞에 붙는다 (nav (P, K), holdings (P, K, T) ...)
+    """
+    rows = np.asarray(rebalance_rows, dtype=np.intp)
+    rebalance_prices = prices[:, rows]
+    n_paths, n_rebalance, n_tickers = rebalance_prices.shape
+
+    holdings = np.zeros((n_paths, n_rebalance, n_tickers))
+    cash = np.empty((n_paths, n_rebalance))
+    fees = np.empty((n_paths, n_rebalance))
+
+    # 리밸런싱 횟수(K)만큼만 순회하고 경로·종목 차원은 벡터 연산
+    previous_holdings = np.zeros((n_paths, n_tickers))
+    current_cash = np.full(n_paths, float(initial_investment))
+    for k in range(n_rebalance):
+        row_prices = rebalance_prices[:, k]
+        total_value = current_cash + np.einsum(
+            "pt,pt->p", previous_holdings, row_prices
+        )
+
+        new_holdings = total_value[:, None] * weights[:, k] / row_prices
+        fee = (np.abs(new_holdings - previous_holdings) * row_prices).sum(
+            axis=1
+        ) * trading_fee
+
+        current_cash = (
+            total_value - np.einsum("pt,pt->p", new_holdings, row_prices) - fee
+        )
+
+        holdings[:, k] = new_holdings
+        cash[:, k] = current_cash
+        fees[:, k] = fee
+        previous_holdings = new_holdings
+
+    nav = cash + np.einsum("pkt,pkt->pk", holdings, rebalance_prices)
+    return SimulationResult(nav=nav, holdings=holdings, cash=cash, fees=fees)
+
+
+def daily_nav(
+    prices: np.ndarray,
+    rebalance_rows: np.ndarray,
+    holdings: np.ndarray,
+    cash: np.ndarray,
+    end_row: int,
+    chunk_rows: int = 4096,
+) -> np.ndarray:
+    """첫 리밸런싱 행부터 end_row 까지 매 거래일의 NAV (직전 리밸런싱 보유 수량 × 그날 가격 + 현금)
+
+    - holdings, cash: rebalance_rows 시점별 리밸런싱 직후 보유 수량 (K, T), 현금 (K,)
+    - 행마다 직전 리밸런싱 번호를 이진 탐색으로 구해 한 번에 곱하며, 메모리를 위해 chunk_rows 행씩 나눈다.
+    """
+    rebalance_rows = np.asarray(rebalance_rows, dtype=np.intp)
+    if not len(rebalance_rows) or end_row < rebalance_rows[0]:
+        return np.empty(0)
+
+    rows = np.arange(rebalance_rows[0], end_row + 1)
+    segments = np.searchsorted(rebalance_rows, rows, "right") - 1
+    nav = np.empty(len(rows))
+    for start in range(0, len(rows), chunk_rows):
+        end = start + chunk_rows
+        segment = segments[start:end]
+        nav[start:end] = cash[segment] + np.einsum(
+            "nt,nt->n", holdings[segment], prices[rows[start:end]]
+        )
+    return nav
@@ -0,0 +1,159 @@
+import csv
+import importlib.util
+import io
+import json
+from typing import Iterator
+
+import numpy as np
+
+from src.database import SessionLocal
+from src.snowball.codec import SeriesTable, decode_series
+from src.snowball.service import (
+    get_existing_backtest_weight_tickers,
+    iter_backtest_series,
+)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# 한 번에 인코딩해 내보내는 행 수
+CHUNK_ROWS = 2048
+
+
+def resolve_export_targets(db, data_ids: list[int]) -> tuple[list[int], list[str]]:
+    """존재하는 data_id 목록과 내보낼 비중 칼럼(종목) 목록"""
+    existing, tickers = [], {}
+    for data_id, weights in get_existing_backtest_weight_tickers(db, data_ids):
+        existing.append(data_id)
+        tickers.update(dict.fromkeys(weights or {}))
+    return existing, list(tickers)
+
+
+def align_weights(nav_series: SeriesTable, weight_series: SeriesTable, tickers):
+    """NAV 날짜마다 그 날짜 이전 마지막 리밸런싱 비중 (N, len(tickers)), 없으면 NaN"""
+    weights = np.full((len(nav_series), len(tickers)), np.nan)
+    rows = np.searchsorted(weight_series.days, nav_series.days, "right") - 1
+    valid = rows >= 0
+    for i, ticker in enumerate(tickers):
+        if ticker in weight_series.columns:
+            weights[valid, i] = weight_series.column(ticker)[rows[valid]]
+    return weights
+
+
+def _iter_chunks(data_ids: list[int], tickers: list[str]):
+    """backtest 하나씩 DB 에서 읽어 (data_id, dates, nav, weights) 청크로 나눠 반환"""
+    db = SessionLocal()
+    try:
+        for data_id, nav_blob, weights_blob in iter_backtest_series(db, data_ids):
+            nav_series = decode_series(nav_blob)
+            weights = align_weights(nav_series, decode_series(weights_blob), tickers)
+            nav = nav_series.column("nav")
+            dates = nav_series.dates
+            for start in range(0, len(nav_series), CHUNK_ROWS):
+                end = start + CHUNK_ROWS
+                yield data_id, dates[start:end], nav[start:end], weights[start:end]
+    finally:
+        db.close()
+
+
+def _to_optional(values: list[float]) -> list[float | None]:
+    return [None if value != value else value for value in values]  # NaN → None
+
+
+def _ndjson(data_ids: list[int], tickers: list[str]) -> Iterator[bytes]:
+    for data_id, dates, nav, weights in _iter_chunks(data_ids, tickers):
+        lines = [
+            json.dumps(
+                {
+                    "data_id": data_id,
+                    "date": str(date),
+                    "nav": value,
+                    **dict(zip(tickers, _to_optional(row))),
+                }
+            )
+            for date, value, row in zip(dates, nav.tolist(), weights.tolist())
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _csv(data_ids: list[int], tickers: list[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["data_id", "date", "nav", *tickers])
+    yield buffer.getvalue().encode()
+
+    for data_id, dates, nav, weights in _iter_chunks(data_ids, tickers):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [data_id, str(date), value, *("" if w != w else w for w in row)]
+            for date, value, row in zip(dates, nav.tolist(), weights.tolist())
+        )
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Arrow IPC writer 가 쓴 바이트를 모아 두었다가 청크 단위로 꺼내는 파일 객체"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def arrow_available() -> bool:
+    """arrow 형식(선택 사항)에 필요한 pyarrow 가 설치되어 있는지 (import 하지 않고 확인)"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _arrow(data_ids: list[int], tickers: list[str]) -> Iterator[bytes]:
+    # pyarrow 는 import 비용이 커서 arrow 내보내기를 처음 요청할 때 불러옴
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [
+            ("data_id", pa.int32()),
+            ("date", pa.date32()),
+            ("nav", pa.float64()),
+            *[(ticker, pa.float64()) for ticker in tickers],
+        ]
+    )
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for data_id, dates, nav, weights in _iter_chunks(data_ids, tickers):
+            writer.write_batch(
+                pa.record_batch(
+                    [
+                        pa.array(np.full(len(nav), data_id, dtype=np.int32)),
+                        pa.array(dates),
+                        pa.array(nav),
+                        *[
+                            pa.array(weights[:, i], from_pandas=True)
+                            for i in range(len(tickers))
+                        ],
+                    ],
+                    schema=schema,
+                )
+            )
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_nav_export(
+    data_ids: list[int], tickers: list[str], fmt: str
+) -> Iterator[bytes]:
+    """data_id 순서대로 NAV·비중 시계열을 fmt 형식의 바이트 청크로 스트리밍"""
+    encoders = {"ndjson": _ndjson, "csv": _csv, "arrow": _arrow}
+    return encoders[fmt](data_ids, tickers)
@@ -1,41 +1,93 @@
+import time
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.snowball.models import BacktestResult, Stock
+from src.config import get_setting
+from src.metrics import stage_timer
+from src.snowball.codec import SeriesTable, decode_series, encode_series, to_epoch_days
+from src.snowball.engine import SimulationResult, daily_nav, simulate
+from src.snowball.models import BacktestResult
+from src.snowball.prices import (
+    PriceMatrix,
+    get_price_matrix,
+    invalidate_price_cache,
+    refresh_price_snapshot,
+)
+from src.snowball.result_cache import make_request_hash, result_cache
+from src.snowball.rolling import rolling_cache
 from src.snowball.schema import BacktestReq
-from src.snowball.service import get_backtest_result_by_id, get_by_date
-
-
-def load_excel_to_db(db: Session):
-    """엑셀 파일에서 종가 데이터를 읽어 DB에 저장"""
+from src.snowball.service import (
+    backtest_result_has_hash,
+    get_backtest_summary_by_hash,
+    get_backtest_result_by_id,
+    get_backtest_results_after,
+    get_backtest_summary_by_id,
+    get_price_data_version,
+    upsert_stock_prices,
+)
+from src.snowball.strategies import DEFAULT_STRATEGY, Strategy
+from src.snowball.trading_calendar import TradingCalendar
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TICKERS = ["SPY", "QQQ", "GLD", "TIP", "BIL"]
+# calculate_performance 가 반환하고 BacktestResult 에 저장되는 통계값
+METRICS = ("total_return", "cagr", "vol", "sharpe", "mdd")
+
+
+def load_excel_to_db(db: Session) -> dict[str, Any]:
+    """엑셀 파일에서 종가 데이터를 읽어 DB에 일괄 upsert 하고 처리 결과 반환"""
+    import pandas as pd  # 적재할 때만 필요하므로 import 시점에 불러오지 않음
+
+    started = time.perf_counter()
     EXCEL_FILE_PATH = "src/snowball/백엔드 과제.xlsx"
     df = pd.read_excel(EXCEL_FILE_PATH, sheet_name="가격")
     df = df.iloc[:, :6]
-    df = df.set_axis(["Date", "SPY", "QQQ", "GLD", "TIP", "BIL"], axis=1)
+    df = df.set_axis(["Date", *TICKERS], axis=1)
 
     df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
     df = df.dropna()
+    # 한 배치 안에 같은 (date, ticker) 가 두 번 나오면 ON CONFLICT 가 실패하므로 제거
+    df = df.drop_duplicates(subset="Date", keep="last")
+
+    # ✅ (날짜 × 종목) 시트를 (date, ticker, price) 행으로 펼침
+    prices = df[TICKERS].to_numpy(dtype=np.float64)
+    rows = [
+        {"date": date, "ticker": ticker, "price": price}
+        for date, ticker, price in zip(
+            np.repeat(df["Date"].to_numpy(), len(TICKERS)),
+            np.tile(TICKERS, len(df)).tolist(),
+            prices.ravel().tolist(),
+        )
+    ]
 
-    for _, row in df.iterrows():
-        for ticker in ["SPY", "QQQ", "GLD", "TIP", "BIL"]:
-            stock_data = Stock(date=row["Date"], ticker=ticker, price=row[ticker])
-            db.merge(stock_data)
-
+    inserted, updated = upsert_stock_prices(db, rows)
     db.commit()
+    invalidate_price_cache()
+    refresh_price_snapshot(db, DEFAULT_STRATEGY.tickers)
     print("✅ 엑셀 데이터가 성공적으로 DB에 저장되었습니다.")
 
+    return {
+        "rows": len(rows),
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(rows) - inserted - updated,
+        "elapsed_sec": time.perf_counter() - started,
+    }
+
 
 # 최근 N개월 수익률 계산
-def calculate_momentum(df: pd.DataFrame | pd.Series, period: int):
+def calculate_momentum(df: "pd.DataFrame | pd.Series", period: int):
     return df.pct_change(periods=period).iloc[-1]
 
 
 # 비중 계산
-def calculate_weights(df: pd.DataFrame, rebalance_period: int) -> list[tuple]:
+def calculate_weights(df: "pd.DataFrame", rebalance_period: int) -> list[tuple]:
     TIP = "TIP"
     SAFE_ASSET = "BIL"
 
@@ -72,110 +124,192 @@ def calculate_rebalance_date_and_weights(
     start_date: datetime,
     end_date: datetime,
     backtest_req: BacktestReq,
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
+    calendar: TradingCalendar | None = None,
 ) -> dict[datetime, list[tuple]]:
-    rebalance_info = {}
-    current_date = start_date
+    """calendar 는 df.index 와 같은 날짜로 만든 거래 달력 (없으면 새로 생성)"""
+    if calendar is None:
+        calendar = TradingCalendar(df.index.to_numpy(dtype="datetime64[D]"))
 
-    while current_date <= end_date:
-        trade_date = datetime(
-            current_date.year, current_date.month, backtest_req.trade_date
-        )
-        trade_date = pd.Timestamp(trade_date)
-        df.index = pd.to_datetime(df.index)
-        valid_dates = df.index[
-            (df.index.year == trade_date.year) & (df.index.month == trade_date.month)
-        ]
-
-        if trade_date not in valid_dates:
-            trade_date = valid_dates[valid_dates < trade_date].max()
-
-        if pd.notna(trade_date):  # 유효한 날짜만 저장
-            # ✅ rebalance_period 전의 데이터만 사용
-            rebalance_start_date = trade_date - pd.DateOffset(
-                months=backtest_req.rebalance_period
-            )
-            period_data = df.loc[rebalance_start_date:trade_date]  # type: ignore[misc] # rebalance_start_date를 intager로 예상함.
-            rebalance_info[trade_date] = calculate_weights(
-                period_data, backtest_req.rebalance_period
-            )
+    rebalance_period = backtest_req.rebalance_period
+    rows = calendar.rebalance_rows(
+        start_date, end_date, backtest_req.trade_date, rebalance_period
+    )
+    # ✅ rebalance_period 전의 데이터만 사용 (백테스트 시작일 이전 데이터는 제외)
+    first_row = calendar.first_on_or_after(start_date)
+    window_starts = np.maximum(
+        calendar.window_starts(rows, rebalance_period), first_row
+    )
 
-        # ✅ rebalance_period 개월 뒤로 이동
-        next_month = (current_date.month - 1 + backtest_req.rebalance_period) % 12 + 1
-        next_year = (
-            current_date.year
-            + (current_date.month - 1 + backtest_req.rebalance_period) // 12
-        )
-        current_date = datetime(next_year, next_month, 1)  # 🔹 정확한 월 이동
+    rebalance_info = {}
+    for row, window_start in zip(rows, window_starts):
+        period_data = df.iloc[window_start : row + 1]
+        rebalance_info[df.index[row]] = calculate_weights(period_data, rebalance_period)
 
     return rebalance_info
 
 
-def make_rebalance_weights(rebalance_info) -> list[dict]:
-    """rebalance_info를 디비에 저장하기 위한 형식으로 변환"""
-    res = []
-    for date, weight_data in rebalance_info.items():
-        row = {ticker: weight for ticker, weight in weight_data}
-        row["date"] = date
-        res.append(row)
-    return res
+def calculate_rebalance_schedule(
+    start_date: datetime,
+    end_date: datetime,
+    backtest_req: BacktestReq,
+    price_matrix: PriceMatrix,
+    strategy: Strategy = DEFAULT_STRATEGY,
+) -> tuple[np.ndarray, np.ndarray]:
+    """리밸런싱 행 번호 (K,) 와 strategy 의 목표 비중 (K, T) 계산"""
+    calendar = price_matrix.calendar
+    rows = calendar.rebalance_rows(
+        start_date, end_date, backtest_req.trade_date, backtest_req.rebalance_period
+    )
+    first_row = calendar.first_on_or_after(start_date)
+    return rows, strategy.weights(
+        price_matrix, rows, backtest_req.rebalance_period, first_row
+    )
+
+
+def make_weight_series(
+    price_matrix: PriceMatrix,
+    rows: np.ndarray,
+    weights: np.ndarray,
+    output_tickers: tuple[str, ...] = DEFAULT_STRATEGY.output_tickers,
+) -> SeriesTable:
+    """리밸런싱 행 번호·비중 행렬을 output_tickers 열의 저장용 시계열로 변환"""
+    position = {ticker: i for i, ticker in enumerate(price_matrix.tickers)}
+    columns = [position[ticker] for ticker in output_tickers]
+    return SeriesTable(
+        days=to_epoch_days(price_matrix.dates[rows]),
+        columns=output_tickers,
+        values=weights[:, columns],
+    )
+
+
+def make_nav_series(
+    price_matrix: PriceMatrix,
+    rows: np.ndarray,
+    holdings: np.ndarray,
+    cash: np.ndarray,
+    nav: np.ndarray,
+    nav_frequency: str,
+    end_date: datetime,
+) -> SeriesTable:
+    """nav_frequency 에 따라 리밸런싱일 NAV 또는 첫 리밸런싱 이후 매 거래일 NAV 시계열
+
+    - rows: 리밸런싱 행 번호, holdings/cash/nav: 각 리밸런싱 직후 보유 수량·현금·NAV
+    """
+    if nav_frequency == "daily" and len(rows):
+        end_row = price_matrix.calendar.last_on_or_before(end_date)
+        nav = daily_nav(price_matrix.prices, rows, holdings, cash, end_row)
+        days = to_epoch_days(price_matrix.dates[rows[0] : rows[0] + len(nav)])
+    else:
+        days = to_epoch_days(price_matrix.dates[rows])
+    return SeriesTable(days=days, columns=("nav",), values=nav[:, None])
+
+
+def make_final_state(
+    price_matrix: PriceMatrix,
+    rows: np.ndarray,
+    backtest_req: BacktestReq,
+    result: SimulationResult,
+    start: int = 0,
+    state: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """이어서 계산할 때 복원할 마지막 확정 리밸런싱 직후의 보유 수량과 현금
+
+    - rows: 전체 리밸런싱 행 번호, result: rows[start:] 를 시뮬레이션한 결과
+    - state: rows[:start] 까지의 상태 (start 이후 확정된 리밸런싱이 없으면 그대로 반환)
+    """
+    settled = price_matrix.calendar.settled_count(rows, backtest_req.trade_date)
+    if settled <= start:
+        return state or {
+            "rebalances": 0,
+            "cash": float(backtest_req.initial_investment),
+            "holdings": {},
+        }
+    k = settled - start - 1
+    # 보유하지 않은 종목은 저장하지 않음 (복원 시 0)
+    held = np.flatnonzero(result.holdings[k])
+    return {
+        "rebalances": settled,
+        "cash": float(result.cash[k]),
+        "holdings": {
+            price_matrix.tickers[i]: float(result.holdings[k, i]) for i in held
+        },
+    }
+
+
+def get_last_rebalance_weight(weight_series: SeriesTable) -> list[tuple[str, float]]:
+    """마지막 리밸런싱 비중을 (ticker, weight) 목록으로 변환"""
+    if not len(weight_series):
+        return []
+    return [
+        (ticker, float(weight))
+        for ticker, weight in zip(weight_series.columns, weight_series.values[-1])
+    ]
+
+
+def make_backtest_result_values(
+    backtest_req: BacktestReq,
+    nav_series: SeriesTable,
+    weight_series: SeriesTable,
+    performance: dict[str, Any],
+    request_hash: str | None = None,
+    final_state: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """백테스트 입력과 결과를 BacktestResult 컬럼 값으로 변환"""
+    compress = get_setting().BACKTEST_BLOB_COMPRESSION
+
+    return {
+        "start_year": backtest_req.start_year,
+        "start_month": backtest_req.start_month,
+        "initial_investment": backtest_req.initial_investment,
+        "trade_date": backtest_req.trade_date,
+        "trading_fee": backtest_req.trading_fee,
+        "rebalance_period": backtest_req.rebalance_period,
+        "nav_frequency": backtest_req.nav_frequency,
+        "nav_history": encode_series(nav_series, compress=compress),
+        "rebalance_weights": encode_series(weight_series, compress=compress),
+        **{metric: float(performance[metric]) for metric in METRICS},
+        "last_rebalance_weight": dict(get_last_rebalance_weight(weight_series)),
+        "request_hash": request_hash,
+        "final_state": final_state,
+    }
 
 
 def save_backtest_result(
     backtest_req: BacktestReq,
-    nav_history: list[dict[str, Any]],
-    rebalance_weights: list[dict],
+    nav_series: SeriesTable,
+    weight_series: SeriesTable,
+    performance: dict[str, Any],
     db: Session,
+    request_hash: str | None = None,
+    final_state: dict[str, Any] | None = None,
 ) -> int:
-    formatted_nav = [
-        {**record, "date": record["date"].isoformat()} for record in nav_history
-    ]
-    formatted_weights = [
-        {**record, "date": record["date"].isoformat()} for record in rebalance_weights
-    ]
-
     backtest_result = BacktestResult(
-        start_year=backtest_req.start_year,
-        start_month=backtest_req.start_month,
-        initial_investment=backtest_req.initial_investment,
-        trade_date=backtest_req.trade_date,
-        trading_fee=backtest_req.trading_fee,
-        rebalance_period=backtest_req.rebalance_period,
-        nav_history=formatted_nav,
-        rebalance_weights=formatted_weights,
+        **make_backtest_result_values(
+            backtest_req,
+            nav_series,
+            weight_series,
+            performance,
+            request_hash,
+            final_state,
+        )
     )
     db.add(backtest_result)
     db.commit()
     return backtest_result.data_id
 
 
-# 백테스트 실행
-def run_backtest(db: Session, backtest_req: BacktestReq) -> dict[str, Any]:
-    tickers = ["SPY", "QQQ", "GLD", "TIP", "BIL"]
-    # ETF 가격 데이터 가져오기
-    start_date = datetime(backtest_req.start_year, backtest_req.start_month, 1)
-    end_date = datetime.now()
-
-    price_data = {
-        ticker: get_by_date(db, ticker, start_date, end_date) for ticker in tickers
-    }
-
-    # 데이터프레임 변환
-    df = pd.DataFrame(
-        {
-            ticker: [entry.price for entry in data]
-            for ticker, data in price_data.items()
-        },
-        index=[entry.date for entry in price_data[tickers[0]]],
-    )
-
-    rebalance_info = calculate_rebalance_date_and_weights(
-        start_date=start_date, end_date=end_date, backtest_req=backtest_req, df=df
-    )
-    # 리밸런싱 로직 실행
+def simulate_backtest_loop(
+    df: "pd.DataFrame",
+    rebalance_info: dict[datetime, list[tuple]],
+    backtest_req: BacktestReq,
+) -> tuple[list[dict[str, Any]], list[tuple]]:
+    """행 단위 루프로 구현한 기존 시뮬레이션 (벡터화 엔진의 참조 구현)"""
+    tickers = list(df.columns)
     cash = backtest_req.initial_investment
     holdings = {ticker: 0 for ticker in tickers}
     nav_history = []
+    weights: list[tuple] = []
 
     for date, row in df.iterrows():
         if date in rebalance_info:  # type: ignore[attr-defined]  # Mypy가 date를 Hashable로 오해함
@@ -218,33 +352,311 @@ def run_backtest(db: Session, backtest_req: BacktestReq) -> dict[str, Any]:
             )
             nav_history.append({"date": date, "nav": total_nav})
 
-    # 결과 데이터프레임
-    rebalance_weights = make_rebalance_weights(rebalance_info)
-    data_id = save_backtest_result(backtest_req, nav_history, rebalance_weights, db)
-    performance = calculate_performance(nav_history)
+    return nav_history, weights
+
+
+def compute_backtest(
+    price_matrix: PriceMatrix,
+    backtest_req: BacktestReq,
+    end_date: datetime,
+    strategy: Strategy = DEFAULT_STRATEGY,
+) -> dict[str, Any]:
+    """DB 없이 가격 행렬만으로 백테스트를 계산"""
+    start_date = datetime(backtest_req.start_year, backtest_req.start_month, 1)
+
+    with stage_timer("schedule"):
+        rows, weight_matrix = calculate_rebalance_schedule(
+            start_date=start_date,
+            end_date=end_date,
+            backtest_req=backtest_req,
+            price_matrix=price_matrix,
+            strategy=strategy,
+        )
+    # 리밸런싱 로직 실행
+    with stage_timer("simulate"):
+        result = simulate(
+            prices=price_matrix.prices,
+            rebalance_rows=rows,
+            weights=weight_matrix,
+            initial_investment=backtest_req.initial_investment,
+            trading_fee=backtest_req.trading_fee,
+        )
+    weight_series = make_weight_series(
+        price_matrix, rows, weight_matrix, strategy.output_tickers
+    )
+    nav_series = make_nav_series(
+        price_matrix,
+        rows,
+        result.holdings,
+        result.cash,
+        result.nav,
+        backtest_req.nav_frequency,
+        end_date,
+    )
+
+    with stage_timer("performance"):
+        performance = calculate_series_performance(nav_series)
+
     return {
-        "data_id": data_id,
-        "last_rebalance_weight": weights,
+        "nav_series": nav_series,
+        "weight_series": weight_series,
+        "last_rebalance_weight": get_last_rebalance_weight(weight_series),
         "output": performance,
+        "final_state": make_final_state(price_matrix, rows, backtest_req, result),
+    }
+
+
+# 백테스트 실행
+def run_backtest(db: Session, backtest_req: BacktestReq) -> dict[str, Any]:
+    # ✅ 같은 요청·같은 가격 데이터면 저장된 결과를 그대로 반환
+    price_version = get_price_data_version(db)
+    request_hash = make_request_hash(backtest_req, price_version)
+    cached = result_cache.get(
+        request_hash,
+        lambda value: backtest_result_has_hash(db, value["data_id"], request_hash),
+    )
+    if cached is not None:
+        return cached
+
+    stored = get_backtest_summary_by_hash(db, request_hash)
+    if stored is not None:
+        result_cache.record_db_hit()
+        response = {
+            "data_id": stored.data_id,
+            "last_rebalance_weight": list((stored.last_rebalance_weight or {}).items()),
+            "output": {metric: getattr(stored, metric) for metric in METRICS},
+        }
+        result_cache.put(request_hash, response)
+        return response
+
+    result_cache.record_miss()
+    # ETF 가격 데이터 가져오기
+    with stage_timer("load_prices"):
+        price_matrix = get_price_matrix(db, DEFAULT_STRATEGY.tickers, price_version)
+    result = compute_backtest(price_matrix, backtest_req, end_date=datetime.now())
+
+    with stage_timer("save"):
+        data_id = save_backtest_result(
+            backtest_req,
+            result["nav_series"],
+            result["weight_series"],
+            result["output"],
+            db,
+            request_hash=request_hash,
+            final_state=result["final_state"],
+        )
+    response = {
+        "data_id": data_id,
+        "last_rebalance_weight": result["last_rebalance_weight"],
+        "output": result["output"],
+    }
+    result_cache.put(request_hash, response)
+    return response
+
+
+def _append_series(series: SeriesTable, keep: int, tail: SeriesTable) -> SeriesTable:
+    """series 의 앞 keep 행 뒤에 tail 을 이어 붙인 시계열"""
+    return SeriesTable(
+        days=np.concatenate([series.days[:keep], tail.days]),
+        columns=series.columns,
+        values=np.concatenate([series.values[:keep], tail.values]),
+    )
+
+
+def stored_backtest_req(stored: BacktestResult) -> BacktestReq:
+    return BacktestReq(
+        **{field: getattr(stored, field) for field in BacktestReq.model_fields}
+    )
+
+
+def extend_backtest_result(
+    stored: BacktestResult,
+    price_matrix: PriceMatrix,
+    end_date: datetime,
+    request_hash: str | None = None,
+    strategy: Strategy = DEFAULT_STRATEGY,
+) -> bool:
+    """저장된 결과의 마지막 확정 상태를 복원해 이후 리밸런싱만 계산하고 제자리 갱신
+
+    새로 계산할 리밸런싱이 없으면 False 를 반환하고 아무것도 바꾸지 않는다.
+    저장된 상태가 없거나 (이전 버전 결과) 확정 구간의 리밸런싱 날짜가 달라졌으면
+    처음부터 다시 계산한다.
+    """
+    backtest_req = stored_backtest_req(stored)
+    start_date = datetime(backtest_req.start_year, backtest_req.start_month, 1)
+    rows, weight_matrix = calculate_rebalance_schedule(
+        start_date=start_date,
+        end_date=end_date,
+        backtest_req=backtest_req,
+        price_matrix=price_matrix,
+        strategy=strategy,
+    )
+    days = to_epoch_days(price_matrix.dates[rows])
+    nav_series = decode_series(stored.nav_history)
+    weight_series = decode_series(stored.rebalance_weights)
+
+    state = stored.final_state
+    start = state["rebalances"] if state else 0
+    if not (
+        start <= min(len(rows), len(weight_series))
+        and np.array_equal(days[:start], weight_series.days[:start])
+    ):
+        state, start = None, 0
+    # 저장된 리밸런싱이 모두 확정됐고 새 리밸런싱일이 (일별이면 새 거래일도) 없으면 그대로 둠
+    daily = backtest_req.nav_frequency == "daily"
+    last_day = price_matrix.calendar.days[
+        price_matrix.calendar.last_on_or_before(end_date)
+    ]
+    if (
+        start == len(weight_series)
+        and np.array_equal(days, weight_series.days)
+        and not (daily and len(nav_series) and nav_series.days[-1] < last_day)
+    ):
+        return False
+
+    initial_holdings = (
+        np.array([state["holdings"].get(t, 0.0) for t in price_matrix.tickers])
+        if state
+        else None
+    )
+    result = simulate(
+        prices=price_matrix.prices,
+        rebalance_rows=rows[start:],
+        weights=weight_matrix[start:],
+        initial_investment=state["cash"] if state else backtest_req.initial_investment,
+        trading_fee=backtest_req.trading_fee,
+        initial_holdings=initial_holdings,
+    )
+    weight_tail = make_weight_series(
+        price_matrix, rows[start:], weight_matrix[start:], strategy.output_tickers
+    )
+    weight_series = _append_series(weight_series, start, weight_tail)
+
+    if daily and start > 0:
+        # 일별 NAV 는 마지막 확정 리밸런싱일부터 그 상태의 보유 수량으로 다시 이어 붙임
+        nav_tail = make_nav_series(
+            price_matrix,
+            rows[start - 1 :],
+            np.vstack([initial_holdings, result.holdings]),
+            np.concatenate([[state["cash"]], result.cash]),
+            np.empty(0),
+            "daily",
+            end_date,
+        )
+        keep = int(np.searchsorted(nav_series.days, days[start - 1], "left"))
+    else:
+        nav_tail = make_nav_series(
+            price_matrix,
+            rows[start:],
+            result.holdings,
+            result.cash,
+            result.nav,
+            backtest_req.nav_frequency,
+            end_date,
+        )
+        keep = start if not daily else 0
+    nav_series = _append_series(nav_series, keep, nav_tail)
+
+    values = make_backtest_result_values(
+        backtest_req,
+        nav_series,
+        weight_series,
+        calculate_series_performance(nav_series),
+        request_hash,
+        make_final_state(price_matrix, rows, backtest_req, result, start, state),
+    )
+    for column, value in values.items():
+        setattr(stored, column, value)
+    return True
+
+
+def extend_backtest(db: Session, data_id: int) -> dict[str, Any] | None:
+    """data_id 의 저장 결과를 최신 가격까지 이어서 계산하고 갱신된 통계값 반환"""
+    stored = get_backtest_result_by_id(db, data_id)
+    if stored is None:
+        return None
+
+    price_version = get_price_data_version(db)
+    price_matrix = get_price_matrix(db, DEFAULT_STRATEGY.tickers, price_version)
+    request_hash = make_request_hash(stored_backtest_req(stored), price_version)
+    if extend_backtest_result(stored, price_matrix, datetime.now(), request_hash):
+        db.commit()
+        result_cache.discard_data_id(data_id)
+        rolling_cache.discard_data_id(data_id)
+
+    return {
+        "data_id": stored.data_id,
+        "last_rebalance_weight": list((stored.last_rebalance_weight or {}).items()),
+        "output": {metric: getattr(stored, metric) for metric in METRICS},
     }
 
 
+def refresh_stored_backtests(db: Session, batch_size: int = 100) -> dict[str, int]:
+    """저장된 모든 백테스트를 data_id 순으로 batch_size 개씩 최신 가격까지 이어서 계산"""
+    price_version = get_price_data_version(db)
+    price_matrix = get_price_matrix(db, DEFAULT_STRATEGY.tickers, price_version)
+    end_date = datetime.now()
+    report = {"extended": 0, "unchanged": 0, "failed": 0}
+
+    cursor = 0
+    while batch := get_backtest_results_after(db, cursor, batch_size):
+        for stored in batch:
+            try:
+                extended = extend_backtest_result(
+                    stored,
+                    price_matrix,
+                    end_date,
+                    make_request_hash(stored_backtest_req(stored), price_version),
+                )
+            except (IndexError, ZeroDivisionError):
+                # 리밸런싱이 1회 이하라 통계값을 계산할 수 없는 경우
+                report["failed"] += 1
+                continue
+            report["extended" if extended else "unchanged"] += 1
+            if extended:
+                result_cache.discard_data_id(stored.data_id)
+                rolling_cache.discard_data_id(stored.data_id)
+        db.commit()
+        cursor = batch[-1].data_id
+        # 다음 배치를 읽기 전에 이미 갱신한 객체는 세션에서 해제해 메모리 유지
+        db.expunge_all()
+
+    return report
+
+
 def calculate_performance(
     nav_history: list[dict[str, Any]], risk_free_rate: float = 0.02
 ) -> dict[str, Any]:
     """백테스트 결과에서 통계값 계산"""
-    df = pd.DataFrame(nav_history, columns=["date", "nav"])
-    df["date"] = pd.to_datetime(df["date"])
-    df["returns"] = df["nav"].pct_change()
-
-    total_return = df["nav"].iloc[-1] / df["nav"].iloc[0] - 1
-    num_years = (df["date"].iloc[-1] - df["date"].iloc[0]).days / 365.25
-    cagr = (df["nav"].iloc[-1] / df["nav"].iloc[0]) ** (1 / num_years) - 1
-    volatility = df["returns"].std() * np.sqrt(252)
+    days = to_epoch_days([str(record["date"])[:10] for record in nav_history])
+    nav = np.array([record["nav"] for record in nav_history], dtype=np.float64)
+    return calculate_performance_arrays(days, nav, risk_free_rate)
+
+
+def calculate_series_performance(
+    nav_series: SeriesTable, risk_free_rate: float = 0.02
+) -> dict[str, Any]:
+    return calculate_performance_arrays(
+        nav_series.days, nav_series.column("nav"), risk_free_rate
+    )
+
+
+def calculate_performance_arrays(
+    days: np.ndarray, nav: np.ndarray, risk_free_rate: float = 0.02
+) -> dict[str, Any]:
+    """epoch-day 배열과 NAV 배열로 통계값 계산 (DataFrame 생성 없이)"""
+    returns = nav[1:] / nav[:-1] - 1
+
+    total_return = nav[-1] / nav[0] - 1
+    num_years = int(days[-1] - days[0]) / 365.25
+    cagr = (nav[-1] / nav[0]) ** (1 / num_years) - 1
+    # pandas std 와 같이 표본 표준편차 (수익률이 2개 미만이면 NaN)
+    volatility = (
+        returns.std(ddof=1) * np.sqrt(252) if len(returns) > 1 else np.float64(np.nan)
+    )
     sharpe_ratio = (cagr - risk_free_rate) / volatility if volatility != 0 else np.nan
-    df["cum_max"] = df["nav"].cummax()
-    df["drawdown"] = df["nav"] / df["cum_max"] - 1
-    mdd = df["drawdown"].min()
+    drawdown = nav / np.maximum.accumulate(nav) - 1
+    mdd = drawdown.min()
 
     return {
         "total_return": total_return,
@@ -255,12 +667,13 @@ def calculate_performance(
     }
 
 
-def proccess_backtest_detail(db: Session, data_id: int):
-    result = get_backtest_result_by_id(db, data_id)
+async def proccess_backtest_detail(db: AsyncSession, data_id: int):
+    """저장된 통계값을 그대로 반환 (시계열은 읽지 않음)"""
+    result = await get_backtest_summary_by_id(db, data_id)
 
     if not result:
         return None, None
 
-    performance = calculate_performance(result.nav_history)
+    performance = {metric: getattr(result, metric) for metric in METRICS}
 
     return result, performance
@@ -0,0 +1,254 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from src.config import get_setting
+from src.database import SessionLocal, discard_inherited_pools
+from src.snowball.flows import run_backtest
+from src.snowball.models import BacktestJob
+from src.snowball.schema import BacktestReq
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """대기 중인 작업 수가 설정된 최대값에 도달한 경우"""
+
+
+def _run_job(job_id: str, params: dict[str, Any], persist: bool) -> int | None:
+    """워커 프로세스에서 백테스트를 실행하고 data_id 반환
+
+    persist 면 먼저 queued → running 으로 바꿔 작업을 선점하고,
+    다른 프로세스가 이미 선점한 작업이면 실행하지 않고 None 을 반환한다.
+    """
+    db = SessionLocal()
+    try:
+        if persist and not _claim_job(db, job_id):
+            return None
+        return run_backtest(db, BacktestReq(**params))["data_id"]
+    finally:
+        db.close()
+
+
+def _claim_job(db: Session, job_id: str) -> bool:
+    # 조건부 UPDATE 는 행 잠금으로 직렬화되므로 여러 프로세스 중 한 곳만 성공
+    stmt = (
+        update(BacktestJob)
+        .where(BacktestJob.job_id == job_id, BacktestJob.status == QUEUED)
+        .values(status=RUNNING, updated_at=datetime.now(UTC))
+    )
+    claimed = db.execute(stmt).rowcount > 0
+    db.commit()
+    return claimed
+
+
+class BacktestJobQueue:
+    """백테스트 작업을 프로세스 풀에서 실행하는 프로세스 내 작업 큐
+
+    persist 가 True 면 작업 상태를 backtest_jobs 테이블에도 기록해 재시작 시 복구한다.
+    여러 워커 프로세스가 같은 테이블을 공유해도 작업은 선점한 한 곳에서만 실행된다.
+    끝난 작업은 retention_seconds 가 지나면 메모리에서 지우고, 이후 조회는 persist 면 DB 에서 읽는다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        persist: bool,
+        stale_seconds: float = 600.0,
+        retention_seconds: float = 3600.0,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.persist = persist
+        self.stale_seconds = stale_seconds
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._futures: dict[str, Future] = {}
+        # 끝난 작업의 job_id → 종료 시각 (끝난 순서대로 들어가므로 앞에서부터 만료)
+        self._finished: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=discard_inherited_pools
+            )
+        return self._executor
+
+    def submit(self, backtest_req: BacktestReq, job_id: str | None = None) -> str:
+        """작업을 큐에 넣고 job_id 를 바로 반환"""
+        job_id = job_id or uuid.uuid4().hex
+        params = backtest_req.model_dump()
+
+        with self._lock:
+            pending = sum(1 for future in self._futures.values() if not future.done())
+            if pending >= self.max_pending:
+                raise QueueFullError(f"대기 중인 작업이 {pending}개로 가득 찼습니다.")
+
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "status": QUEUED,
+                "data_id": None,
+                "error": None,
+            }
+            if self.persist:
+                self._save_new_job(job_id, params)
+            future = self._get_executor().submit(_run_job, job_id, params, self.persist)
+            self._futures[job_id] = future
+
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return job_id
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        if future.cancelled():
+            # shutdown 으로 실행 전에 취소된 작업은 queued 로 남겨 재시작 시 복구
+            with self._lock:
+                self._futures.pop(job_id, None)
+            return
+        error = future.exception()
+        if error is None and future.result() is None:
+            # 다른 프로세스가 선점해 실행한 작업 (상태는 그쪽이 기록하므로 DB 에서 조회)
+            with self._lock:
+                self._jobs.pop(job_id, None)
+                self._futures.pop(job_id, None)
+            return
+        values: dict[str, Any] = (
+            {"status": FAILED, "error": str(error)}
+            if error is not None
+            else {"status": DONE, "data_id": future.result()}
+        )
+        with self._lock:
+            self._jobs[job_id].update(values)
+            self._futures.pop(job_id, None)
+            self._finished[job_id] = time.monotonic()
+            self._evict_finished()
+        if self.persist:
+            self._update_job(job_id, values)
+
+    def _evict_finished(self) -> None:
+        # self._lock 을 잡은 상태에서 호출
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > cutoff:
+                break
+            del self._finished[job_id]
+            # 같은 job_id 로 다시 큐에 들어간 작업은 남김
+            if job_id not in self._futures:
+                self._jobs.pop(job_id, None)
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            self._evict_finished()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job = dict(job)
+                future = self._futures.get(job_id)
+                if future is not None and future.running():
+                    job["status"] = RUNNING
+        if job is None and self.persist:
+            job = self._load_job(job_id)
+        return job
+
+    def restore_pending(self) -> int:
+        """재시작 전에 끝나지 않은 작업을 다시 큐에 넣고 개수 반환
+
+        모든 워커 프로세스가 시작할 때 호출하므로 같은 작업이 여러 큐에 들어갈 수 있지만,
+        실행 직전의 선점(_claim_job)에 성공한 한 곳에서만 실행된다.
+        stale_seconds 넘게 running 인 작업은 중단된 것으로 보고 queued 로 되돌린다.
+        """
+        if not self.persist:
+            return 0
+        db = SessionLocal()
+        try:
+            cutoff = datetime.now(UTC) - timedelta(seconds=self.stale_seconds)
+            db.execute(
+                update(BacktestJob)
+                .where(BacktestJob.status == RUNNING, BacktestJob.updated_at < cutoff)
+                .values(status=QUEUED, updated_at=datetime.now(UTC))
+            )
+            db.commit()
+            stmt = select(BacktestJob.job_id, BacktestJob.request).where(
+                BacktestJob.status == QUEUED
+            )
+            pending = db.execute(stmt).all()
+        finally:
+            db.close()
+
+        for job_id, request in pending:
+            with self._lock:
+                self._jobs[job_id] = {
+                    "job_id": job_id,
+                    "status": QUEUED,
+                    "data_id": None,
+                    "error": None,
+                }
+                future = self._get_executor().submit(
+                    _run_job, job_id, request, self.persist
+                )
+                self._futures[job_id] = future
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        return len(pending)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _save_new_job(self, job_id: str, params: dict[str, Any]) -> None:
+        db = SessionLocal()
+        try:
+            db.add(BacktestJob(job_id=job_id, status=QUEUED, request=params))
+            db.commit()
+        finally:
+            db.close()
+
+    def _update_job(self, job_id: str, values: dict[str, Any]) -> None:
+        db = SessionLocal()
+        try:
+            stmt = (
+                update(BacktestJob)
+                .where(BacktestJob.job_id == job_id)
+                .values(**values, updated_at=datetime.now(UTC))
+            )
+            db.execute(stmt)
+            db.commit()
+        finally:
+            db.close()
+
+    def _load_job(self, job_id: str) -> dict[str, Any] | None:
+        db = SessionLocal()
+        try:
+            job = db.get(BacktestJob, job_id)
+            if job is None:
+                return None
+            return {
+                "job_id": job.job_id,
+                "status": job.status,
+                "data_id": job.data_id,
+                "error": job.error,
+            }
+        finally:
+            db.close()
+
+
+_settings = get_setting()
+job_queue = BacktestJobQueue(
+    max_workers=_settings.BACKTEST_JOB_WORKERS,
+    max_pending=_settings.BACKTEST_JOB_MAX_PENDING,
+    persist=_settings.BACKTEST_JOB_PERSIST,
+    stale_seconds=_settings.BACKTEST_JOB_STALE_SECONDS,
+    retention_seconds=_settings.BACKTEST_JOB_RETENTION_SECONDS,
+)
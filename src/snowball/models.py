@@ -1,7 +1,18 @@
+from datetime import UTC, datetime
 from datetime import date as dt_date
 from typing import Any
 
-from sqlalchemy import JSON, Date, Float, Integer, PrimaryKeyConstraint, String
+from sqlalchemy import (
+    JSON,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.database import Base
@@ -32,8 +43,42 @@ class BacktestResult(Base):
     trade_date: Mapped[int] = mapped_column(Integer, nullable=False)
     trading_fee: Mapped[float] = mapped_column(Float, nullable=False)
     rebalance_period: Mapped[int] = mapped_column(Integer, nullable=False)
+    # NAV 기록 주기 ("rebalance" | "daily")
+    nav_frequency: Mapped[str] = mapped_column(
+        String(10), nullable=False, default="rebalance", server_default="rebalance"
+    )
+
+    # codec.encode_series 로 인코딩한 (epoch-day, float64 열) 바이너리
+    nav_history: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    rebalance_weights: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # save_backtest_result 시점에 계산해 둔 통계값과 마지막 리밸런싱 비중
+    total_return: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cagr: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sharpe: Mapped[float | None] = mapped_column(Float, nullable=True)
+    mdd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_rebalance_weight: Mapped[dict[str, float] | None] = mapped_column(
+        JSON, nullable=True
+    )
+    # 마지막 확정 리밸런싱 직후 상태 {"rebalances", "cash", "holdings"} (이어서 계산할 때 복원)
+    final_state: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # 정규화한 요청 + 가격 데이터 버전의 해시 (결과 캐시 키)
+    request_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
 
-    nav_history: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=False)
-    rebalance_weights: Mapped[list[dict[str, Any]]] = mapped_column(
-        JSON, nullable=False
+
+class BacktestJob(Base):
+    __tablename__ = "backtest_jobs"
+
+    job_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    request: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    data_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
     )
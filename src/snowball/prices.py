@@ -0,0 +1,151 @@
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.config import get_setting
+from src.snowball.service import get_price_data_version, get_prices_by_tickers
+from src.snowball.snapshot import read_snapshot, write_snapshot
+from src.snowball.signals import lookback_returns
+from src.snowball.trading_calendar import TradingCalendar
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class PriceMatrix:
+    """날짜×종목으로 정렬된 가격 행렬"""
+
+    dates: np.ndarray  # (N,) datetime64[D], 오름차순
+    tickers: tuple[str, ...]
+    prices: np.ndarray  # (N, T) float64
+    _returns_cache: dict[int, np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def to_frame(self) -> "pd.DataFrame":
+        # pandas 는 참조 구현·엑셀 적재에서만 쓰므로 필요할 때 불러옴 (서버 시작 시간 단축)
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.prices, index=pd.DatetimeIndex(self.dates), columns=self.tickers
+        )
+
+    @cached_property
+    def frame(self) -> "pd.DataFrame":
+        """스냅샷 단위로 공유하는 DataFrame (수정하지 말 것)"""
+        return self.to_frame()
+
+    @cached_property
+    def calendar(self) -> TradingCalendar:
+        """스냅샷 단위로 공유하는 거래 달력"""
+        return TradingCalendar(self.dates)
+
+    def lookback_returns(self, lookback: int) -> np.ndarray:
+        """lookback 행 수익률 테이블 (스냅샷·lookback 별로 한 번만 계산)"""
+        returns = self._returns_cache.get(lookback)
+        if returns is None:
+            returns = lookback_returns(self.prices, lookback)
+            returns.flags.writeable = False
+            self._returns_cache[lookback] = returns
+        return returns
+
+
+def build_price_matrix(rows, tickers: list[str]) -> PriceMatrix:
+    """(date, ticker, price) 행을 날짜×종목 행렬로 피벗 (모든 종목 가격이 있는 날짜만 사용)"""
+    if not rows:
+        return PriceMatrix(
+            dates=np.empty(0, dtype="datetime64[D]"),
+            tickers=tuple(tickers),
+            prices=np.empty((0, len(tickers))),
+        )
+
+    row_dates, row_tickers, row_prices = zip(*rows)
+    dates, date_idx = np.unique(
+        np.array(row_dates, dtype="datetime64[D]"), return_inverse=True
+    )
+    ticker_pos = {ticker: i for i, ticker in enumerate(tickers)}
+    ticker_idx = np.array([ticker_pos[ticker] for ticker in row_tickers])
+
+    prices = np.full((len(dates), len(tickers)), np.nan)
+    prices[date_idx, ticker_idx] = np.array(row_prices, dtype=np.float64)
+
+    # 일부 종목의 가격이 비어 있는 날짜는 제외해 정렬을 맞춤
+    complete = ~np.isnan(prices).any(axis=1)
+    return PriceMatrix(
+        dates=dates[complete], tickers=tuple(tickers), prices=prices[complete]
+    )
+
+
+# ✅ 프로세스 단위 가격 행렬 캐시 (가격 데이터 버전과 함께 저장해 다른 프로세스의 갱신도 감지)
+_price_cache: dict[tuple[str, ...], tuple[str, PriceMatrix]] = {}
+_price_cache_lock = threading.Lock()
+_price_cache_generation = 0
+
+
+def get_price_matrix(
+    db: Session, tickers: list[str], version: str | None = None
+) -> PriceMatrix:
+    """종목 전체 기간의 가격 행렬을 캐시에서 가져오고, 없거나 버전이 다르면 DB 에서 한 번에 조회
+
+    version 은 get_price_data_version 값으로, 호출자가 이미 조회했다면 넘겨서 재조회를 생략한다.
+    """
+    if version is None:
+        version = get_price_data_version(db)
+    key = tuple(tickers)
+    with _price_cache_lock:
+        cached = _price_cache.get(key)
+        generation = _price_cache_generation
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    matrix = _load_price_snapshot(key, version)
+    if matrix is None:
+        matrix = build_price_matrix(
+            get_prices_by_tickers(db, list(tickers)), list(tickers)
+        )
+    with _price_cache_lock:
+        # 조회 도중 무효화되었다면 오래된 행렬을 캐시에 넣지 않음
+        if generation == _price_cache_generation:
+            _price_cache[key] = (version, matrix)
+    return matrix
+
+
+def _load_price_snapshot(tickers: tuple[str, ...], version: str) -> PriceMatrix | None:
+    """PRICE_SNAPSHOT_DIR 의 스냅샷을 읽기 전용으로 매핑 (없거나 버전이 다르면 None)"""
+    directory = get_setting().PRICE_SNAPSHOT_DIR
+    if not directory:
+        return None
+    snapshot = read_snapshot(directory)
+    if snapshot is None:
+        return None
+    snapshot_version, dates, snapshot_tickers, prices = snapshot
+    if snapshot_tickers != tickers or snapshot_version != version:
+        return None
+    return PriceMatrix(dates=dates, tickers=tickers, prices=prices)
+
+
+def refresh_price_snapshot(db: Session, tickers) -> None:
+    """DB 의 가격으로 스냅샷을 새로 만들어 원자적으로 교체 (PRICE_SNAPSHOT_DIR 가 없으면 무시)"""
+    directory = get_setting().PRICE_SNAPSHOT_DIR
+    if not directory:
+        return
+    # 버전을 먼저 읽어 두면 조회 중 가격이 바뀌어도 스냅샷이 오래된 것으로 판정됨
+    version = get_price_data_version(db)
+    matrix = build_price_matrix(get_prices_by_tickers(db, list(tickers)), list(tickers))
+    path = write_snapshot(
+        directory, version, matrix.dates, matrix.tickers, matrix.prices
+    )
+    print(f"✅ 가격 스냅샷 저장: {path}")
+
+
+def invalidate_price_cache() -> None:
+    """가격 데이터가 변경되면 캐시된 가격 행렬을 모두 제거"""
+    global _price_cache_generation
+    with _price_cache_lock:
+        _price_cache.clear()
+        _price_cache_generation += 1
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from src.config import get_setting
+from src.snowball.schema import BacktestReq
+
+
+def make_request_hash(backtest_req: BacktestReq, price_version: str) -> str:
+    """정규화한 요청과 가격 데이터 버전으로 만든 캐시 키 (sha256)"""
+    normalized = {
+        key: float(value) if isinstance(value, float) else value
+        for key, value in backtest_req.model_dump().items()
+    }
+    payload = json.dumps(
+        {"req": normalized, "price_version": price_version}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """요청 해시 → 백테스트 응답을 보관하는 LRU 메모리 캐시 (DB 캐시 앞단)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: str, is_valid: Callable[[dict[str, Any]], bool] | None = None
+    ) -> dict[str, Any] | None:
+        """캐시된 응답 조회
+
+        다른 워커 프로세스가 결과를 삭제·갱신해도 이 캐시는 알 수 없으므로,
+        is_valid 가 주어지면 적중한 응답을 확인하고 False 면 제거한 뒤 None 을 반환한다.
+        """
+        with self._lock:
+            value = self._items.get(key)
+        if value is None:
+            return None
+        # DB 확인은 락 밖에서 (다른 요청의 캐시 조회를 막지 않도록)
+        if is_valid is not None and not is_valid(value):
+            with self._lock:
+                if self._items.get(key) is value:
+                    del self._items[key]
+            return None
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+            self.memory_hits += 1
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def record_db_hit(self) -> None:
+        with self._lock:
+            self.db_hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def discard_data_id(self, data_id: int) -> None:
+        """삭제된 백테스트를 가리키는 항목 제거"""
+        with self._lock:
+            for key in [k for k, v in self._items.items() if v["data_id"] == data_id]:
+                del self._items[key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+            }
+
+
+result_cache = ResultCache(maxsize=get_setting().RESULT_CACHE_SIZE)
@@ -0,0 +1,122 @@
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.config import get_setting
+from src.snowball.codec import SeriesTable, decode_series
+from src.snowball.result_cache import ResultCache
+from src.snowball.service import get_backtest_nav_history, get_backtest_request_hash
+
+# calculate_performance 와 같은 연환산 기준
+TRADING_DAYS = 252
+DAYS_PER_YEAR = 365.25
+
+
+def rolling_return(nav: np.ndarray, window: int) -> np.ndarray:
+    """각 시점의 window 기간 수익률 (앞쪽 window 개는 NaN)"""
+    out = np.full(len(nav), np.nan)
+    if window < len(nav):
+        out[window:] = nav[window:] / nav[:-window] - 1
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """누적합으로 계산한 window 구간 표본 표준편차 (O(n), 앞쪽 window - 1 개는 NaN)"""
+    out = np.full(len(values), np.nan)
+    if window < 2 or window > len(values):
+        return out
+    # 평균을 빼서 제곱합 차이의 상쇄 오차를 줄임
+    centered = values - values.mean()
+    sums = np.concatenate([[0.0], np.cumsum(centered)])
+    squares = np.concatenate([[0.0], np.cumsum(centered * centered)])
+    window_sum = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    variance = (window_squares - window_sum * window_sum / window) / (window - 1)
+    out[window - 1 :] = np.sqrt(np.maximum(variance, 0.0))
+    return out
+
+
+def rolling_volatility(nav: np.ndarray, window: int) -> np.ndarray:
+    """각 시점까지 window 개 수익률의 연환산 변동성 (앞쪽 window 개는 NaN)"""
+    out = np.full(len(nav), np.nan)
+    if len(nav) > 1:
+        returns = nav[1:] / nav[:-1] - 1
+        out[1:] = rolling_std(returns, window) * np.sqrt(TRADING_DAYS)
+    return out
+
+
+def rolling_cagr(days: np.ndarray, nav: np.ndarray, window: int) -> np.ndarray:
+    """window 기간 수익률을 실제 경과 일수로 연환산"""
+    out = np.full(len(nav), np.nan)
+    if window < len(nav):
+        years = (days[window:] - days[:-window]).astype(np.float64) / DAYS_PER_YEAR
+        out[window:] = (nav[window:] / nav[:-window]) ** (1 / years) - 1
+    return out
+
+
+def drawdown(nav: np.ndarray) -> np.ndarray:
+    """누적 최고점 대비 하락률 (underwater 곡선)"""
+    return nav / np.maximum.accumulate(nav) - 1
+
+
+def rolling_metrics(
+    nav_series: SeriesTable, window: int, risk_free_rate: float = 0.02
+) -> dict[str, np.ndarray]:
+    """NAV 시계열의 window 구간 수익률·변동성·샤프 지수와 낙폭 곡선"""
+    nav = nav_series.column("nav")
+    volatility = rolling_volatility(nav, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = (
+            rolling_cagr(nav_series.days, nav, window) - risk_free_rate
+        ) / volatility
+    sharpe[volatility == 0] = np.nan
+    return {
+        "rolling_return": rolling_return(nav, window),
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "drawdown": drawdown(nav),
+    }
+
+
+def _to_optional(values: np.ndarray) -> list[float | None]:
+    # NaN → None
+    return [None if value != value else value for value in values.tolist()]
+
+
+rolling_cache = ResultCache(maxsize=get_setting().ROLLING_CACHE_SIZE)
+
+
+def _rolling_response(blob: bytes, data_id: int, window: int) -> dict:
+    nav_series = decode_series(blob, columns=["nav"])
+    metrics = rolling_metrics(nav_series, window)
+    return {
+        "data_id": data_id,
+        "window": window,
+        "dates": nav_series.dates.tolist(),
+        **{name: _to_optional(values) for name, values in metrics.items()},
+    }
+
+
+async def get_rolling_metrics(
+    db: AsyncSession, data_id: int, window: int
+) -> dict | None:
+    """(data_id, 요청 해시, window) 별로 캐시한 롤링 지표 응답 (저장 결과가 없으면 None)
+
+    이어서 계산하면 요청 해시가 바뀌므로 다른 프로세스가 갱신한 결과도 캐시에서 다시 계산된다.
+    """
+    row = await get_backtest_request_hash(db, data_id)
+    if row is None:
+        return None
+    key = f"{data_id}:{row.request_hash}:{window}"
+    cached = rolling_cache.get(key)
+    if cached is not None:
+        return cached
+
+    blob = await get_backtest_nav_history(db, data_id)
+    if blob is None:
+        return None
+    rolling_cache.record_miss()
+    # 디코딩·롤링 계산은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    response = await run_in_threadpool(_rolling_response, blob, data_id, window)
+    rolling_cache.put(key, response)
+    return response
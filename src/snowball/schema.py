@@ -1,6 +1,20 @@
-from typing import Any
+import math
+from datetime import date
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+
+class StockIngestResp(BaseModel):
+    rows: int
+    inserted: int
+    updated: int
+    unchanged: int
+    elapsed_sec: float
+
+
+# NAV 기록 주기: rebalance 는 리밸런싱일만, daily 는 첫 리밸런싱 이후 모든 거래일
+NavFrequency = Literal["rebalance", "daily"]
 
 
 class BacktestReq(BaseModel):
@@ -10,6 +24,7 @@ class BacktestReq(BaseModel):
     trade_date: int
     trading_fee: float
     rebalance_period: int
+    nav_frequency: NavFrequency = "rebalance"
 
     class Config:
         json_schema_extra = {
@@ -20,23 +35,26 @@ class BacktestReq(BaseModel):
                 "trade_date": 15,
                 "trading_fee": 0.001,
                 "rebalance_period": 3,
+                "nav_frequency": "rebalance",
             }
         }
 
 
 class BacktestResp(BaseModel):
     data_id: int
-    output: dict[str, float]
+    output: dict[str, float | None]
     last_rebalance_weight: list[tuple[str, float]]
 
 
 class BacktestItem(BaseModel):
     data_id: int
-    last_rebalance_weight: list[dict[str, Any]]
+    last_rebalance_weight: list[tuple[str, float]]
 
 
 class BacktestListResp(BaseModel):
     backtests: list[BacktestItem]
+    # 다음 페이지 요청 시 cursor 로 전달 (없으면 마지막 페이지)
+    next_cursor: int | None = None
 
 
 class BacktestInputResp(BaseModel):
@@ -46,18 +64,197 @@ class BacktestInputResp(BaseModel):
     trade_date: int
     cost: float
     caculate_month: int
+    nav_frequency: NavFrequency
 
 
 class BacktestOutputResp(BaseModel):
+    """통계값 (리밸런싱이 1회 이하라 계산할 수 없어 NULL 로 저장된 행은 null)"""
+
     data_id: int
-    total_return: float
-    cagr: float
-    vol: float
-    sharpe: float
-    mdd: float
+    total_return: float | None
+    cagr: float | None
+    vol: float | None
+    sharpe: float | None
+    mdd: float | None
 
 
 class BacktestDetailResp(BaseModel):
     input: BacktestInputResp
     output: BacktestOutputResp
     last_rebalance_weight: list[tuple[str, float]]
+
+
+class BacktestRollingResp(BaseModel):
+    """NAV 시점별 롤링 지표 (window 개 미만 구간은 null)"""
+
+    data_id: int
+    window: int
+    dates: list[date]
+    rolling_return: list[float | None]
+    volatility: list[float | None]
+    sharpe: list[float | None]
+    drawdown: list[float | None]
+
+
+class BacktestCompareReq(BaseModel):
+    data_ids: list[int]
+    risk_free_rate: float = 0.02
+
+    class Config:
+        json_schema_extra = {"example": {"data_ids": [1, 2, 3], "risk_free_rate": 0.02}}
+
+
+class BacktestCompareResp(BaseModel):
+    """요청한 data_id 순서의 열 단위 표 (계산할 수 없는 통계값은 null)"""
+
+    data_id: list[int]
+    start_year: list[int]
+    start_month: list[int]
+    initial_investment: list[float]
+    trade_date: list[int]
+    trading_fee: list[float]
+    rebalance_period: list[int]
+    nav_frequency: list[NavFrequency]
+    nav_points: list[int]
+    total_return: list[float | None]
+    cagr: list[float | None]
+    vol: list[float | None]
+    sharpe: list[float | None]
+    mdd: list[float | None]
+    missing: list[int]  # 저장된 결과가 없는 data_id
+
+
+class BacktestBootstrapReq(BaseModel):
+    n_paths: int = Field(default=1000, ge=1)
+    # 한 번에 이어 붙이는 거래일 수 (약 1개월)
+    block_size: int = Field(default=21, ge=1)
+    seed: int | None = Field(default=None, ge=0)  # 없으면 새로 만들어 응답에 포함
+    percentiles: list[Annotated[float, Field(ge=0, le=100)]] = Field(
+        default=[5, 25, 50, 75, 95], min_length=1
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "n_paths": 1000,
+                "block_size": 21,
+                "seed": 42,
+                "percentiles": [5, 25, 50, 75, 95],
+            }
+        }
+
+
+class BacktestBootstrapResp(BaseModel):
+    data_id: int
+    n_paths: int
+    block_size: int
+    seed: int
+    percentiles: list[float]
+    historical: dict[str, float | None]  # 실제 가격 경로의 저장된 통계값
+    distribution: dict[str, list[float | None]]  # 지표 → percentiles 순서의 분위수
+
+
+# 스윕 범위 하나가 만들 수 있는 최대 값 개수 (전체 조합 수는 SWEEP_MAX_GRID_SIZE 로 따로 제한)
+RANGE_MAX_LENGTH = 10000
+
+
+class IntRange(BaseModel):
+    """start ~ stop (포함) 을 step 간격으로 나열"""
+
+    start: int
+    stop: int
+    step: int = Field(default=1, gt=0)
+
+    @model_validator(mode="after")
+    def check_length(self) -> "IntRange":
+        if self.count() > RANGE_MAX_LENGTH:
+            raise ValueError(f"범위의 값 개수는 {RANGE_MAX_LENGTH}개 이하여야 합니다.")
+        return self
+
+    def count(self) -> int:
+        """values() 를 만들지 않고 계산한 값 개수"""
+        return max((self.stop - self.start) // self.step + 1, 0)
+
+    def values(self) -> list[int]:
+        return list(range(self.start, self.stop + 1, self.step))
+
+
+class FloatRange(BaseModel):
+    """start ~ stop (포함) 을 step 간격으로 나열"""
+
+    start: float
+    stop: float
+    step: float = Field(gt=0)
+
+    @model_validator(mode="after")
+    def check_length(self) -> "FloatRange":
+        steps = (self.stop - self.start) / self.step
+        if not math.isfinite(steps) or steps + 1 > RANGE_MAX_LENGTH:
+            raise ValueError(f"범위의 값 개수는 {RANGE_MAX_LENGTH}개 이하여야 합니다.")
+        return self
+
+    def count(self) -> int:
+        """values() 를 만들지 않고 계산한 값 개수"""
+        return max(int(round((self.stop - self.start) / self.step)) + 1, 0)
+
+    def values(self) -> list[float]:
+        return [round(self.start + i * self.step, 12) for i in range(self.count())]
+
+
+class BacktestSweepReq(BaseModel):
+    start_year: IntRange | list[int]
+    start_month: IntRange | list[int]
+    initial_investment: FloatRange | list[float]
+    trade_date: IntRange | list[int]
+    trading_fee: FloatRange | list[float]
+    rebalance_period: IntRange | list[int]
+    nav_frequency: list[NavFrequency] = ["rebalance"]
+    sort_by: Literal["total_return", "cagr", "vol", "sharpe", "mdd"] = "sharpe"
+    persist: bool = False  # True 면 각 실행 결과를 backtest_results 에 일괄 저장
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "start_year": [2020],
+                "start_month": [1],
+                "initial_investment": [1000.0],
+                "trade_date": {"start": 1, "stop": 28},
+                "trading_fee": [0.0, 0.001, 0.002],
+                "rebalance_period": {"start": 1, "stop": 12},
+                "sort_by": "sharpe",
+                "persist": False,
+            }
+        }
+
+
+class BacktestSweepItem(BaseModel):
+    rank: int
+    data_id: int | None
+    input: BacktestReq
+    output: dict[str, float]
+
+
+class BacktestSweepResp(BaseModel):
+    total: int
+    failed: int
+    results: list[BacktestSweepItem]
+
+
+class CacheStatsResp(BaseModel):
+    size: int
+    maxsize: int
+    memory_hits: int
+    db_hits: int
+    misses: int
+
+
+class ResultCacheStatsResp(CacheStatsResp):
+    # 롤링 지표 캐시 (DB 단계가 없으므로 db_hits 는 항상 0)
+    rolling: CacheStatsResp
+
+
+class BacktestJobResp(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "done", "failed"]
+    data_id: int | None = None
+    error: str | None = None
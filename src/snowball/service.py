@@ -1,28 +1,98 @@
-from datetime import date
+from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, insert, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.snowball.models import BacktestResult, Stock
 
 
-def get_by_date(db: Session, ticker: str, start_date: date, end_date: date):
-    """Stock 테이블의 특정 데이터 조회"""
+def upsert_stock_prices(
+    db: Session, rows: list[dict[str, Any]], batch_size: int = 1000
+) -> tuple[int, int]:
+    """(date, ticker, price) 행을 배치 단위 INSERT ... ON CONFLICT 로 저장
+
+    가격이 같은 행은 갱신하지 않으며, (삽입된 행 수, 갱신된 행 수) 를 반환
+    """
+    inserted = updated = 0
+    for start in range(0, len(rows), batch_size):
+        stmt = pg_insert(Stock).values(rows[start : start + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Stock.date, Stock.ticker],
+            set_={"price": stmt.excluded.price},
+            where=Stock.price.is_distinct_from(stmt.excluded.price),
+        ).returning(literal_column("xmax = 0").label("inserted"))
+
+        # 새로 삽입된 행은 xmax 가 0, 갱신된 행은 0 이 아님
+        for (is_inserted,) in db.execute(stmt):
+            if is_inserted:
+                inserted += 1
+            else:
+                updated += 1
+    return inserted, updated
+
+
+def get_prices_by_tickers(db: Session, tickers: list[str]):
+    """여러 종목의 (date, ticker, price) 를 ORM 객체 없이 한 번에 조회"""
     stmt = (
-        select(Stock)
-        .where(
-            Stock.ticker == ticker,
-            Stock.date.between(start_date, end_date),
-        )
+        select(Stock.date, Stock.ticker, Stock.price)
+        .where(Stock.ticker.in_(tickers))
         .order_by(Stock.date)
     )
-    return db.execute(stmt).scalars().all()
+    return db.execute(stmt).all()
 
 
-def get_all_backtest_ids_with_weights(db: Session):
-    """BacktestResult 테이블의 모든 데이터를 조회"""
-    stmt = select(BacktestResult.data_id, BacktestResult.rebalance_weights)
-    return db.execute(stmt).all()
+def get_price_data_version(db: Session) -> str:
+    """stock 테이블의 최신 날짜와 행 수로 만든 가격 데이터 버전"""
+    stmt = select(func.max(Stock.date), func.count())
+    max_date, row_count = db.execute(stmt).one()
+    return f"{max_date}:{row_count}"
+
+
+def get_backtest_summary_by_hash(db: Session, request_hash: str):
+    """같은 요청 해시로 저장된 가장 최근 결과의 data_id·통계값·마지막 비중만 조회 (시계열 칼럼은 읽지 않음)"""
+    stmt = (
+        select(
+            BacktestResult.data_id,
+            BacktestResult.total_return,
+            BacktestResult.cagr,
+            BacktestResult.vol,
+            BacktestResult.sharpe,
+            BacktestResult.mdd,
+            BacktestResult.last_rebalance_weight,
+        )
+        .where(BacktestResult.request_hash == request_hash)
+        .order_by(BacktestResult.data_id.desc())
+        .limit(1)
+    )
+    return db.execute(stmt).one_or_none()
+
+
+def backtest_result_has_hash(db: Session, data_id: int, request_hash: str) -> bool:
+    """data_id 의 저장 결과가 아직 있고 요청 해시도 그대로인지 (기본 키 조회 한 번)"""
+    stmt = select(BacktestResult.data_id).where(
+        BacktestResult.data_id == data_id,
+        BacktestResult.request_hash == request_hash,
+    )
+    return db.execute(stmt).first() is not None
+
+
+async def get_backtest_summaries(
+    db: AsyncSession, cursor: int | None, limit: int, filters: dict[str, Any]
+):
+    """data_id 기준 keyset 페이지네이션으로 (data_id, 마지막 비중) 조회
+
+    filters 는 BacktestResult 입력 칼럼명 → 값 (None 은 조건에서 제외)
+    """
+    stmt = select(BacktestResult.data_id, BacktestResult.last_rebalance_weight)
+    if cursor is not None:
+        stmt = stmt.where(BacktestResult.data_id > cursor)
+    for column, value in filters.items():
+        if value is not None:
+            stmt = stmt.where(getattr(BacktestResult, column) == value)
+    stmt = stmt.order_by(BacktestResult.data_id).limit(limit)
+    return (await db.execute(stmt)).all()
 
 
 def get_backtest_result_by_id(db: Session, data_id: int):
@@ -32,6 +102,103 @@ def get_backtest_result_by_id(db: Session, data_id: int):
     return result
 
 
+def get_backtest_results_after(db: Session, cursor: int, limit: int):
+    """data_id 가 cursor 보다 큰 백테스트 결과를 data_id 순으로 limit 개 조회"""
+    stmt = (
+        select(BacktestResult)
+        .where(BacktestResult.data_id > cursor)
+        .order_by(BacktestResult.data_id)
+        .limit(limit)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def bulk_insert_backtest_results(db: Session, rows: list[dict[str, Any]]) -> list[int]:
+    """여러 백테스트 결과를 한 번에 저장하고 입력 순서대로 data_id 반환"""
+    if not rows:
+        return []
+    stmt = insert(BacktestResult).returning(
+        BacktestResult.data_id, sort_by_parameter_order=True
+    )
+    data_ids = db.execute(stmt, rows).scalars().all()
+    db.commit()
+    return list(data_ids)
+
+
+async def get_backtest_summary_by_id(db: AsyncSession, data_id: int):
+    """data_id 의 입력값·저장된 통계값·마지막 비중만 조회 (시계열 칼럼은 읽지 않음)"""
+    stmt = select(
+        BacktestResult.data_id,
+        BacktestResult.start_year,
+        BacktestResult.start_month,
+        BacktestResult.initial_investment,
+        BacktestResult.trade_date,
+        BacktestResult.trading_fee,
+        BacktestResult.rebalance_period,
+        BacktestResult.nav_frequency,
+        BacktestResult.total_return,
+        BacktestResult.cagr,
+        BacktestResult.vol,
+        BacktestResult.sharpe,
+        BacktestResult.mdd,
+        BacktestResult.last_rebalance_weight,
+    ).where(BacktestResult.data_id == data_id)
+    return (await db.execute(stmt)).one_or_none()
+
+
+async def get_backtest_request_hash(db: AsyncSession, data_id: int):
+    """data_id 의 request_hash 열만 조회한 행 (저장 결과가 없으면 None)"""
+    stmt = select(BacktestResult.request_hash).where(BacktestResult.data_id == data_id)
+    return (await db.execute(stmt)).one_or_none()
+
+
+async def get_backtest_nav_history(db: AsyncSession, data_id: int) -> bytes | None:
+    """data_id 의 NAV 시계열 바이너리만 조회"""
+    stmt = select(BacktestResult.nav_history).where(BacktestResult.data_id == data_id)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+async def get_backtest_navs_by_ids(db: AsyncSession, data_ids: list[int]):
+    """여러 data_id 의 입력값과 NAV 시계열 바이너리를 한 번의 IN 쿼리로 조회"""
+    stmt = select(
+        BacktestResult.data_id,
+        BacktestResult.start_year,
+        BacktestResult.start_month,
+        BacktestResult.initial_investment,
+        BacktestResult.trade_date,
+        BacktestResult.trading_fee,
+        BacktestResult.rebalance_period,
+        BacktestResult.nav_frequency,
+        BacktestResult.nav_history,
+    ).where(BacktestResult.data_id.in_(data_ids))
+    return (await db.execute(stmt)).all()
+
+
+def get_existing_backtest_weight_tickers(db: Session, data_ids: list[int]):
+    """존재하는 data_id 와 마지막 비중의 종목 목록 조회 (시계열 칼럼은 읽지 않음)"""
+    stmt = (
+        select(BacktestResult.data_id, BacktestResult.last_rebalance_weight)
+        .where(BacktestResult.data_id.in_(data_ids))
+        .order_by(BacktestResult.data_id)
+    )
+    return db.execute(stmt).all()
+
+
+def iter_backtest_series(db: Session, data_ids: list[int]):
+    """data_id 순으로 (data_id, nav_history, rebalance_weights) 를 한 행씩 스트리밍 조회"""
+    stmt = (
+        select(
+            BacktestResult.data_id,
+            BacktestResult.nav_history,
+            BacktestResult.rebalance_weights,
+        )
+        .where(BacktestResult.data_id.in_(data_ids))
+        .order_by(BacktestResult.data_id)
+        .execution_options(yield_per=1)
+    )
+    return db.execute(stmt)
+
+
 def delete_backtest_result_by_id(db: Session, data_id: int) -> bool:
     """해당 data_id를 가진 백테스트 결과를 삭제하는 함수"""
     stmt = delete(BacktestResult).where(BacktestResult.data_id == data_id)
@@ -0,0 +1,71 @@
+import numpy as np
+
+# 듀얼 모멘텀 전략의 종목 구성
+CANARY = "TIP"
+CANDIDATES = ("SPY", "QQQ", "GLD")
+SAFE_ASSET = "BIL"
+TOP_N = 2
+
+
+def lookback_returns(prices: np.ndarray, lookback: int) -> np.ndarray:
+    """모든 종목의 lookback 행 수익률 (앞쪽 lookback 행은 NaN)"""
+    returns = np.full(prices.shape, np.nan)
+    if lookback < len(prices):
+        returns[lookback:] = prices[lookback:] / prices[:-lookback] - 1
+    return returns
+
+
+def momentum_at_rows(
+    returns: np.ndarray, rows: np.ndarray, lookback: int, first_row: int = 0
+) -> np.ndarray:
+    """리밸런싱 행의 수익률 (lookback 구간이 first_row 이전으로 넘어가면 NaN)"""
+    momentum = returns[rows]
+    momentum[rows - lookback < first_row] = np.nan
+    return momentum
+
+
+def top_n_mask(scores: np.ndarray, n: int) -> np.ndarray:
+    """행마다 점수 상위 n 개 위치를 True 로 표시
+
+    pandas nlargest 와 같이 NaN 은 유효한 점수가 n 개보다 적을 때만 앞쪽부터 채운다.
+    """
+    n = min(n, scores.shape[1])
+    is_nan = np.isnan(scores)
+    filled = np.where(is_nan, -np.inf, scores)
+    top = np.argpartition(-filled, n - 1, axis=1)[:, :n]
+
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, top, True, axis=1)
+    mask &= ~is_nan
+
+    missing = n - mask.sum(axis=1, keepdims=True)
+    mask |= is_nan & (np.cumsum(is_nan, axis=1) <= missing)
+    return mask
+
+
+def dual_momentum_weights(
+    momentum: np.ndarray,
+    tickers: tuple[str, ...],
+    canary: str = CANARY,
+    candidates: tuple[str, ...] = CANDIDATES,
+    safe_asset: str = SAFE_ASSET,
+    top_n: int = TOP_N,
+) -> np.ndarray:
+    """리밸런싱 시점별 모멘텀 (K, T) 로 목표 비중 (K, T) 계산
+
+    canary(TIP) 모멘텀이 음수면 safe_asset(BIL) 100%,
+    아니면 candidates(SPY/QQQ/GLD) 중 상위 top_n 개에 같은 비중으로 투자
+    """
+    position = {ticker: i for i, ticker in enumerate(tickers)}
+    candidate_cols = np.array([position[ticker] for ticker in candidates])
+    safe = position[safe_asset]
+
+    # ✅ canary 절대 모멘텀 (NaN 이면 음수가 아닌 것으로 취급)
+    risk_off = momentum[:, position[canary]] < 0
+
+    weights = np.zeros(momentum.shape)
+    selected = top_n_mask(momentum[:, candidate_cols], top_n)
+    weights[:, candidate_cols] = np.where(selected, 1 / top_n, 0.0)
+    weights[risk_off] = 0.0
+    weights[risk_off, safe] = 1.0
+    return weights
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# 현재 스냅샷 디렉터리 이름을 가리키는 파일 (os.replace 로 원자적으로 교체)
+POINTER = "CURRENT"
+# 다른 프로세스가 아직 매핑하고 있을 수 있으므로 최근 스냅샷 몇 개는 남겨둠
+KEEP_SNAPSHOTS = 3
+
+
+def write_snapshot(
+    directory: str,
+    version: str,
+    dates: np.ndarray,
+    tickers: tuple[str, ...],
+    prices: np.ndarray,
+) -> Path:
+    """정렬된 날짜·가격 행렬을 npy 파일로 저장하고 CURRENT 가 가리키게 함
+
+    스냅샷 디렉터리는 임시 디렉터리에 쓴 뒤 rename 하고, 한 번 만든 디렉터리는 수정하지 않는다.
+    이름은 내용 전체의 해시라서 버전이 같아도 가격이 정정되면 새 스냅샷을 만든다.
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    meta = json.dumps({"version": version, "tickers": list(tickers)})
+    digest = hashlib.sha256(meta.encode())
+    digest.update(dates.tobytes())
+    digest.update(prices.tobytes())
+    name = f"prices-{digest.hexdigest()[:16]}"
+    target = root / name
+
+    if not target.exists():
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=root))
+        try:
+            np.save(tmp / "dates.npy", dates)
+            np.save(tmp / "prices.npy", prices)
+            (tmp / "meta.json").write_text(meta)
+            os.rename(tmp, target)
+        except OSError:
+            # 다른 프로세스가 같은 스냅샷을 먼저 만든 경우
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not target.exists():
+                raise
+
+    pointer_tmp = root / f".{POINTER}.{os.getpid()}"
+    pointer_tmp.write_text(name)
+    os.replace(pointer_tmp, root / POINTER)
+
+    _remove_old_snapshots(root, keep=name)
+    return target
+
+
+def _remove_old_snapshots(root: Path, keep: str) -> None:
+    snapshots = sorted(
+        (p for p in root.glob("prices-*") if p.name != keep),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for path in snapshots[KEEP_SNAPSHOTS - 1 :]:
+        # 매핑 중인 프로세스는 삭제 후에도 기존 페이지를 그대로 읽을 수 있음
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def read_snapshot_dir(path: str | Path):
+    """스냅샷 디렉터리를 읽기 전용 memmap 으로 열어 (version, dates, tickers, prices) 반환"""
+    path = Path(path)
+    meta = json.loads((path / "meta.json").read_text())
+    dates = np.load(path / "dates.npy", mmap_mode="r")
+    prices = np.load(path / "prices.npy", mmap_mode="r")
+    return meta["version"], dates, tuple(meta["tickers"]), prices
+
+
+def read_snapshot(directory: str):
+    """CURRENT 가 가리키는 스냅샷을 열어 (version, dates, tickers, prices) 반환 (없으면 None)"""
+    root = Path(directory)
+    try:
+        name = (root / POINTER).read_text().strip()
+        return read_snapshot_dir(root / name)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def snapshot_dir_of(prices: np.ndarray) -> Path | None:
+    """스냅샷 전체를 매핑한 가격 배열이면 그 스냅샷 디렉터리 (일부만 잘라낸 배열이나 일반 배열이면 None)"""
+    filename = getattr(prices, "filename", None)
+    if not filename:
+        return None
+    if np.load(filename, mmap_mode="r").shape != prices.shape:
+        return None
+    return Path(filename).parent
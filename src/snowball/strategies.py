@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.snowball.prices import PriceMatrix
+from src.snowball.signals import (
+    CANARY,
+    CANDIDATES,
+    SAFE_ASSET,
+    TOP_N,
+    dual_momentum_weights,
+    momentum_at_rows,
+)
+
+
+class Strategy(ABC):
+    """가격 행렬과 리밸런싱 행 번호로 리밸런싱 시점별 목표 비중 (K, T) 을 계산하는 전략
+
+    종목 차원은 한 번에 벡터 연산으로 처리해야 종목 수가 늘어도 비용이 완만하게 증가한다.
+    """
+
+    @property
+    @abstractmethod
+    def tickers(self) -> tuple[str, ...]:
+        """가격이 필요한 종목 (get_price_matrix 로 불러올 종목)"""
+
+    @property
+    @abstractmethod
+    def output_tickers(self) -> tuple[str, ...]:
+        """비중을 저장·응답할 종목"""
+
+    @abstractmethod
+    def weights(
+        self,
+        price_matrix: PriceMatrix,
+        rows: np.ndarray,
+        rebalance_period: int,
+        first_row: int,
+    ) -> np.ndarray:
+        """rows (K,) 시점의 price_matrix.tickers 순서 목표 비중 (K, T)
+
+        first_row 는 백테스트 시작일의 행 번호 (그 이전 가격은 신호에 사용하지 않음)
+        """
+
+    def path_weights(
+        self,
+        dates: np.ndarray,
+        tickers: tuple[str, ...],
+        paths: np.ndarray,
+        rows: np.ndarray,
+        rebalance_period: int,
+        first_row: int,
+    ) -> np.ndarray:
+        """같은 날짜·종목의 가격 경로 여러 개 (P, N, T) 에 대한 목표 비중 (P, K, T)
+
+        기본 구현은 경로마다 weights 를 호출하므로, 경로 차원까지 벡터화할 수 있는 전략은 재정의한다.
+        """
+        return np.stack(
+            [
+                self.weights(
+                    PriceMatrix(dates=dates, tickers=tickers, prices=prices),
+                    rows,
+                    rebalance_period,
+                    first_row,
+                )
+                for prices in paths
+            ]
+        )
+
+
+@dataclass(frozen=True)
+class DualMomentum(Strategy):
+    """canary 절대 모멘텀이 음수면 safe_asset, 아니면 candidates 중 상대 모멘텀 상위 top_n 개에 균등 투자
+
+    모멘텀 기간은 리밸런싱 주기(개월)와 같다.
+    """
+
+    canary: str = CANARY
+    candidates: tuple[str, ...] = CANDIDATES
+    safe_asset: str = SAFE_ASSET
+    top_n: int = TOP_N
+
+    @property
+    def tickers(self) -> tuple[str, ...]:
+        return (*self.candidates, self.canary, self.safe_asset)
+
+    @property
+    def output_tickers(self) -> tuple[str, ...]:
+        # canary 는 신호로만 쓰고 비중이 없으므로 제외
+        return (*self.candidates, self.safe_asset)
+
+    def weights(
+        self,
+        price_matrix: PriceMatrix,
+        rows: np.ndarray,
+        rebalance_period: int,
+        first_row: int,
+    ) -> np.ndarray:
+        momentum = momentum_at_rows(
+            price_matrix.lookback_returns(rebalance_period),
+            rows,
+            rebalance_period,
+            first_row,
+        )
+        return dual_momentum_weights(
+            momentum,
+            price_matrix.tickers,
+            canary=self.canary,
+            candidates=self.candidates,
+            safe_asset=self.safe_asset,
+            top_n=self.top_n,
+        )
+
+    def path_weights(
+        self,
+        dates: np.ndarray,
+        tickers: tuple[str, ...],
+        paths: np.ndarray,
+        rows: np.ndarray,
+        rebalance_period: int,
+        first_row: int,
+    ) -> np.ndarray:
+        # weights 와 같은 모멘텀을 모든 경로에 대해 한 번에 계산 (lookback 이 first_row 이전이면 NaN)
+        lagged = rows - rebalance_period
+        valid = lagged >= first_row
+        momentum = np.full((len(paths), len(rows), len(tickers)), np.nan)
+        momentum[:, valid] = paths[:, rows[valid]] / paths[:, lagged[valid]] - 1
+        weights = dual_momentum_weights(
+            momentum.reshape(-1, len(tickers)),
+            tickers,
+            canary=self.canary,
+            candidates=self.candidates,
+            safe_asset=self.safe_asset,
+            top_n=self.top_n,
+        )
+        return weights.reshape(momentum.shape)
+
+
+# 현재 서비스하는 전략 (SPY/QQQ/GLD 후보, TIP 카나리아, BIL 안전자산)
+DEFAULT_STRATEGY = DualMomentum()
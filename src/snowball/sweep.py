@@ -0,0 +1,205 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from src.config import get_setting
+from src.snowball.flows import (
+    compute_backtest,
+    make_backtest_result_values,
+)
+from src.snowball.prices import PriceMatrix, get_price_matrix
+from src.snowball.result_cache import make_request_hash
+from src.snowball.schema import (
+    BacktestReq,
+    BacktestSweepItem,
+    BacktestSweepReq,
+    BacktestSweepResp,
+    FloatRange,
+    IntRange,
+)
+from src.snowball.service import (
+    bulk_insert_backtest_results,
+    get_price_data_version,
+)
+from src.snowball.snapshot import read_snapshot_dir, snapshot_dir_of
+from src.snowball.strategies import DEFAULT_STRATEGY
+
+# 지표별 정렬 방향 (True 면 값이 클수록 상위)
+METRIC_DESCENDING = {
+    "total_return": True,
+    "cagr": True,
+    "vol": False,
+    "sharpe": True,
+    "mdd": True,
+}
+
+# 워커 프로세스가 시작될 때 한 번만 전달받는 가격 행렬
+_worker_price_matrix: PriceMatrix | None = None
+
+
+def _init_worker(snapshot_dir, dates, tickers, prices) -> None:
+    global _worker_price_matrix
+    if snapshot_dir is not None:
+        # 부모가 스냅샷을 쓰고 있으면 배열을 복사해 넘기지 않고 같은 파일을 매핑 (페이지 캐시 공유)
+        _, dates, tickers, prices = read_snapshot_dir(snapshot_dir)
+    _worker_price_matrix = PriceMatrix(dates=dates, tickers=tickers, prices=prices)
+
+
+def _run_chunk(
+    params: list[dict[str, Any]], end_date: datetime, include_history: bool
+) -> list[dict[str, Any] | None]:
+    assert _worker_price_matrix is not None
+    return _compute_all(_worker_price_matrix, params, end_date, include_history)
+
+
+def _compute_all(
+    price_matrix: PriceMatrix,
+    params: list[dict[str, Any]],
+    end_date: datetime,
+    include_history: bool,
+) -> list[dict[str, Any] | None]:
+    """파라미터 목록을 순서대로 계산 (성과 지표를 낼 수 없는 조합은 None)"""
+    results: list[dict[str, Any] | None] = []
+    for param in params:
+        try:
+            result = compute_backtest(price_matrix, BacktestReq(**param), end_date)
+        except (IndexError, ZeroDivisionError):
+            # 리밸런싱이 1회 이하라 통계값을 계산할 수 없는 경우
+            results.append(None)
+            continue
+
+        result["output"] = {k: float(v) for k, v in result["output"].items()}
+        if not include_history:
+            del result["nav_series"], result["weight_series"], result["final_state"]
+        results.append(result)
+    return results
+
+
+def _grid_axes(sweep_req: BacktestSweepReq) -> list[list | IntRange | FloatRange]:
+    return [getattr(sweep_req, field) for field in BacktestReq.model_fields]
+
+
+def grid_size(sweep_req: BacktestSweepReq) -> int:
+    """조합을 만들지 않고 각 필드의 값 개수를 곱해 계산한 조합 수"""
+    return math.prod(
+        len(axis) if isinstance(axis, list) else axis.count()
+        for axis in _grid_axes(sweep_req)
+    )
+
+
+def expand_grid(sweep_req: BacktestSweepReq) -> list[BacktestReq]:
+    """각 필드의 범위를 조합해 BacktestReq 목록 생성"""
+    fields = list(BacktestReq.model_fields)
+    axes = [
+        axis if isinstance(axis, list) else axis.values()
+        for axis in _grid_axes(sweep_req)
+    ]
+
+    return [
+        BacktestReq(**dict(zip(fields, combination)))
+        for combination in itertools.product(*axes)
+    ]
+
+
+def run_grid(
+    price_matrix: PriceMatrix,
+    reqs: list[BacktestReq],
+    end_date: datetime,
+    include_history: bool = False,
+    max_workers: int | None = None,
+) -> list[dict[str, Any] | None]:
+    """그리드를 프로세스 풀에 나눠 계산 (입력 순서대로 결과 반환)"""
+    params = [req.model_dump() for req in reqs]
+    workers = min(max_workers or os.cpu_count() or 1, len(params))
+
+    if workers <= 1:
+        return _compute_all(price_matrix, params, end_date, include_history)
+
+    # 워커당 여러 청크를 배정해 조합별 계산 시간 차이를 흡수
+    chunk_size = math.ceil(len(params) / (workers * 4))
+    chunks = [params[i : i + chunk_size] for i in range(0, len(params), chunk_size)]
+    snapshot_dir = snapshot_dir_of(price_matrix.prices)
+    if snapshot_dir is not None:
+        initargs = (snapshot_dir, None, None, None)
+    else:
+        initargs = (None, price_matrix.dates, price_matrix.tickers, price_matrix.prices)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=initargs
+    ) as executor:
+        futures = [
+            executor.submit(_run_chunk, chunk, end_date, include_history)
+            for chunk in chunks
+        ]
+        return [result for future in futures for result in future.result()]
+
+
+def run_backtest_sweep(db: Session, sweep_req: BacktestSweepReq) -> BacktestSweepResp:
+    settings = get_setting()
+    # 조합을 만들기 전에 개수만 계산해 큰 그리드를 거부
+    size = grid_size(sweep_req)
+    if size > settings.SWEEP_MAX_GRID_SIZE:
+        raise ValueError(
+            f"조합 수({size})가 최대값({settings.SWEEP_MAX_GRID_SIZE})을 초과합니다."
+        )
+    reqs = expand_grid(sweep_req)
+
+    # 가격 행렬은 한 번만 불러와 모든 조합이 공유
+    price_version = get_price_data_version(db)
+    price_matrix = get_price_matrix(db, DEFAULT_STRATEGY.tickers, price_version)
+    results = run_grid(
+        price_matrix,
+        reqs,
+        end_date=datetime.now(),
+        include_history=sweep_req.persist,
+        max_workers=settings.SWEEP_MAX_WORKERS,
+    )
+    succeeded = [(req, res) for req, res in zip(reqs, results) if res is not None]
+
+    data_ids: list[int | None] = [None] * len(succeeded)
+    if sweep_req.persist:
+        # 단건 요청과 같은 캐시 키를 함께 저장해 이후 동일 요청이 재사용하도록 함
+        data_ids = list(
+            bulk_insert_backtest_results(
+                db,
+                [
+                    make_backtest_result_values(
+                        req,
+                        res["nav_series"],
+                        res["weight_series"],
+                        res["output"],
+                        make_request_hash(req, price_version),
+                        res["final_state"],
+                    )
+                    for req, res in succeeded
+                ],
+            )
+        )
+
+    # 정렬 기준 지표로 순위 매기기 (NaN 은 맨 뒤)
+    sign = -1 if METRIC_DESCENDING[sweep_req.sort_by] else 1
+    order = sorted(
+        range(len(succeeded)),
+        key=lambda i: (
+            math.isnan(succeeded[i][1]["output"][sweep_req.sort_by]),
+            sign * succeeded[i][1]["output"][sweep_req.sort_by],
+        ),
+    )
+
+    return BacktestSweepResp(
+        total=len(reqs),
+        failed=len(reqs) - len(succeeded),
+        results=[
+            BacktestSweepItem(
+                rank=rank,
+                data_id=data_ids[i],
+                input=succeeded[i][0],
+                output=succeeded[i][1]["output"],
+            )
+            for rank, i in enumerate(order, start=1)
+        ],
+    )
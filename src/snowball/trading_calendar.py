@@ -0,0 +1,81 @@
+from datetime import date
+
+import numpy as np
+
+
+def _month_day(months: np.ndarray, day: np.ndarray | int) -> np.ndarray:
+    """월(datetime64[M])의 day 일을 int64 일수로 변환 (말일을 넘으면 말일로 맞춤)"""
+    first_day = months.astype("datetime64[D]").astype(np.int64)
+    last_day = (months + 1).astype("datetime64[D]").astype(np.int64) - 1
+    return np.minimum(first_day + np.asarray(day) - 1, last_day)
+
+
+def _to_day(value: date) -> int:
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+
+class TradingCalendar:
+    """정렬된 거래일(int64 일수) 배열 위에서 이진 탐색으로 날짜를 찾는 거래 달력
+
+    가격 스냅샷 하나당 한 번만 만들고, 같은 스냅샷을 쓰는 모든 백테스트가 공유한다.
+    """
+
+    def __init__(self, dates: np.ndarray):
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.days = self.dates.astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def first_on_or_after(self, value: date) -> int:
+        """value 이후 첫 거래일의 행 번호 (없으면 len)"""
+        return int(np.searchsorted(self.days, _to_day(value), "left"))
+
+    def last_on_or_before(self, value: date) -> int:
+        """value 이전 마지막 거래일의 행 번호 (없으면 -1)"""
+        return int(np.searchsorted(self.days, _to_day(value), "right")) - 1
+
+    def resolve_month_days(self, months: np.ndarray, day: int) -> np.ndarray:
+        """각 월의 day 일 또는 그 이전의 같은 달 마지막 거래일 행 번호 (없으면 -1)"""
+        months = np.asarray(months, dtype="datetime64[M]")
+        targets = _month_day(months, day)
+        rows = np.searchsorted(self.days, targets, "right") - 1
+
+        # 같은 달 안에서 찾은 거래일만 유효
+        month_start = months.astype("datetime64[D]").astype(np.int64)
+        valid = rows >= 0
+        valid[valid] = self.days[rows[valid]] >= month_start[valid]
+        return np.where(valid, rows, -1)
+
+    def rebalance_rows(
+        self, start_date: date, end_date: date, trade_date: int, period: int
+    ) -> np.ndarray:
+        """start_date 가 속한 달부터 period 개월마다의 리밸런싱 행 번호"""
+        start_month = np.datetime64(start_date, "M")
+        end_month = np.datetime64(end_date, "M")
+        months = np.arange(start_month, end_month + 1, period)
+
+        rows = self.resolve_month_days(months, trade_date)
+        rows = rows[rows >= 0]
+        return rows[self.days[rows] <= _to_day(end_date)]
+
+    def settled_count(self, rows: np.ndarray, trade_date: int) -> int:
+        """rebalance_rows 중 해당 월 trade_date 까지 가격이 들어와 더 이상 바뀌지 않는 행 수
+
+        마지막 거래일이 그 달의 trade_date 이전이면 그 달의 리밸런싱일은 이후 가격이
+        추가될 때 뒤로 밀릴 수 있다 (오름차순이므로 바뀔 수 있는 것은 마지막 행뿐).
+        """
+        if not len(rows) or not len(self.days):
+            return 0
+        months = self.dates[rows].astype("datetime64[M]")
+        return int(np.count_nonzero(_month_day(months, trade_date) <= self.days[-1]))
+
+    def window_starts(self, rows: np.ndarray, months: int) -> np.ndarray:
+        """각 행 날짜로부터 months 개월 전 이후의 첫 행 번호"""
+        row_dates = self.dates[rows]
+        row_months = row_dates.astype("datetime64[M]")
+        day_of_month = (row_dates - row_months.astype("datetime64[D]")).astype(
+            np.int64
+        ) + 1
+        targets = _month_day(row_months - months, day_of_month)
+        return np.searchsorted(self.days, targets, "left")
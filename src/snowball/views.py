@@ -1,63 +1,270 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
-from src.snowball.flows import load_excel_to_db, proccess_backtest_detail, run_backtest
+from src.database import get_async_db, get_db
+from src.snowball import export
+from src.snowball.bootstrap import run_backtest_bootstrap
+from src.snowball.compare import compare_backtests
+from src.snowball.flows import (
+    extend_backtest,
+    load_excel_to_db,
+    proccess_backtest_detail,
+    run_backtest,
+)
+from src.snowball.jobs import QueueFullError, job_queue
+from src.snowball.result_cache import result_cache
+from src.snowball.rolling import get_rolling_metrics, rolling_cache
 from src.snowball.schema import (
+    BacktestBootstrapReq,
+    BacktestBootstrapResp,
+    BacktestCompareReq,
+    BacktestCompareResp,
     BacktestDetailResp,
     BacktestInputResp,
     BacktestItem,
+    BacktestJobResp,
     BacktestListResp,
     BacktestOutputResp,
     BacktestReq,
     BacktestResp,
+    BacktestRollingResp,
+    BacktestSweepReq,
+    BacktestSweepResp,
+    NavFrequency,
+    ResultCacheStatsResp,
+    StockIngestResp,
 )
 from src.snowball.service import (
     delete_backtest_result_by_id,
-    get_all_backtest_ids_with_weights,
+    get_backtest_summaries,
 )
+from src.snowball.sweep import run_backtest_sweep
 
 router = APIRouter()
 
+# /backtest/list 한 페이지의 최대 항목 수
+LIST_MAX_LIMIT = 500
+# /backtest/nav 한 번에 내보낼 수 있는 최대 data_id 수
+EXPORT_MAX_IDS = 1000
+# /backtest/compare 한 번에 비교할 수 있는 최대 data_id 수
+COMPARE_MAX_IDS = 500
+
+ExportFormat = Literal["ndjson", "csv", "arrow"]
 
-@router.post("/history", response_model=None)
+
+@router.post("/history", response_model=StockIngestResp)
 def fetch_and_store_etf_prices(db: Session = Depends(get_db)):
     try:
         # SPY, QQQ, GLD, BIL 데이터 가져오기
-        load_excel_to_db(db=db)
+        return StockIngestResp(**load_excel_to_db(db=db))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 저장 실패: {str(e)}")
 
 
-@router.post("/backtest", response_model=BacktestResp)
-def backtest_endpoint(backtest_req: BacktestReq, db: Session = Depends(get_db)):
-    """입력을 받아 작성한 계산 로직을 실행, 저장하고, 저장 항목의 key 인 data_id 와 통계값을 반환하는 API"""
+@router.post("/backtest", response_model=BacktestResp | BacktestJobResp)
+def backtest_endpoint(
+    backtest_req: BacktestReq,
+    response: Response,
+    async_mode: bool = Query(default=False, alias="async"),
+    db: Session = Depends(get_db),
+):
+    """입력을 받아 작성한 계산 로직을 실행, 저장하고, 저장 항목의 key 인 data_id 와 통계값을 반환하는 API
+
+    async=true 면 작업 큐에 넣고 job_id 를 바로 반환 (GET /backtest/jobs/{job_id} 로 조회)
+    """
+    if async_mode:
+        try:
+            job_id = job_queue.submit(backtest_req)
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        response.status_code = 202
+        return BacktestJobResp(job_id=job_id, status="queued")
+
     result = run_backtest(db, backtest_req)
     return BacktestResp(**result)
 
 
+@router.post("/backtest/{data_id}/extend", response_model=BacktestResp)
+def extend_backtest_endpoint(data_id: int, db: Session = Depends(get_db)):
+    """저장된 백테스트를 마지막 확정 상태부터 최신 가격까지 이어서 계산하고 제자리 갱신하는 API"""
+    try:
+        result = extend_backtest(db, data_id)
+    except (IndexError, ZeroDivisionError):
+        raise HTTPException(
+            status_code=422, detail="통계값을 계산할 수 없는 백테스트입니다."
+        )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Backtest result not found")
+    return BacktestResp(**result)
+
+
+@router.post("/backtest/{data_id}/bootstrap", response_model=BacktestBootstrapResp)
+def bootstrap_backtest_endpoint(
+    data_id: int,
+    bootstrap_req: BacktestBootstrapReq,
+    db: Session = Depends(get_db),
+):
+    """저장된 백테스트의 일별 수익률을 블록 부트스트랩한 경로들로 전략을 다시 실행해 지표 분위수를 반환하는 API"""
+    try:
+        result = run_backtest_bootstrap(db, data_id, bootstrap_req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Backtest result not found")
+    return BacktestBootstrapResp(**result)
+
+
+@router.get("/backtest/jobs/{job_id}", response_model=BacktestJobResp)
+def get_backtest_job(job_id: str):
+    """비동기 백테스트 작업의 상태와 완료 시 data_id 를 반환하는 API"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return BacktestJobResp(**job)
+
+
+@router.post("/backtest/sweep", response_model=BacktestSweepResp)
+def backtest_sweep_endpoint(sweep_req: BacktestSweepReq, db: Session = Depends(get_db)):
+    """각 입력값의 범위를 조합해 백테스트를 일괄 실행하고 지표 기준으로 순위를 매겨 반환하는 API"""
+    try:
+        return run_backtest_sweep(db, sweep_req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/backtest/compare", response_model=BacktestCompareResp)
+async def compare_backtests_endpoint(
+    compare_req: BacktestCompareReq, db: AsyncSession = Depends(get_async_db)
+):
+    """여러 data_id 의 입력값과 NAV 로 계산한 통계값을 한 번에 열 단위 표로 반환하는 API"""
+    # 중복은 처음 나온 순서대로 하나만 남김
+    data_ids = list(dict.fromkeys(compare_req.data_ids))
+    if not data_ids or len(data_ids) > COMPARE_MAX_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"data_ids 는 1~{COMPARE_MAX_IDS}개여야 합니다."
+        )
+    return BacktestCompareResp(
+        **await compare_backtests(db, data_ids, compare_req.risk_free_rate)
+    )
+
+
+@router.get("/backtest/cache/stats", response_model=ResultCacheStatsResp)
+def get_result_cache_stats():
+    """백테스트 결과 캐시와 롤링 지표 캐시의 크기와 적중/미스 횟수를 반환하는 API"""
+    return ResultCacheStatsResp(**result_cache.stats(), rolling=rolling_cache.stats())
+
+
 @router.get("/backtest/list", response_model=BacktestListResp)
-def get_data_id_list(db: Session = Depends(get_db)):
-    """저장된 data_id 목록을 반환하는 API"""
-    results = get_all_backtest_ids_with_weights(db)
-    if not results:
-        raise
+async def get_data_id_list(
+    cursor: int | None = Query(default=None, description="이전 페이지의 next_cursor"),
+    limit: int = Query(default=50, ge=1, le=LIST_MAX_LIMIT),
+    start_year: int | None = None,
+    start_month: int | None = None,
+    initial_investment: float | None = None,
+    trade_date: int | None = None,
+    trading_fee: float | None = None,
+    rebalance_period: int | None = None,
+    nav_frequency: NavFrequency | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """저장된 data_id 와 마지막 리밸런싱 비중을 data_id 순으로 페이지 단위로 반환하는 API"""
+    filters = {
+        "start_year": start_year,
+        "start_month": start_month,
+        "initial_investment": initial_investment,
+        "trade_date": trade_date,
+        "trading_fee": trading_fee,
+        "rebalance_period": rebalance_period,
+        "nav_frequency": nav_frequency,
+    }
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회
+    results = await get_backtest_summaries(db, cursor, limit + 1, filters)
+    page = results[:limit]
+
     # Pydantic 모델을 이용한 변환
     response_data = BacktestListResp(
         backtests=[
-            BacktestItem(data_id=data_id, last_rebalance_weight=weights)
-            for data_id, weights in results
-        ]
+            BacktestItem(
+                data_id=data_id,
+                last_rebalance_weight=list((weights or {}).items()),
+            )
+            for data_id, weights in page
+        ],
+        next_cursor=page[-1].data_id if len(results) > limit else None,
     )
 
     return response_data
 
 
+def _nav_export_response(
+    db: Session, data_ids: list[int], fmt: str
+) -> StreamingResponse:
+    if fmt == "arrow" and not export.arrow_available():
+        raise HTTPException(
+            status_code=501,
+            detail="arrow 형식을 사용하려면 pyarrow 패키지가 필요합니다.",
+        )
+    data_ids, tickers = export.resolve_export_targets(db, data_ids)
+    if not data_ids:
+        raise HTTPException(status_code=404, detail="Backtest result not found")
+    return StreamingResponse(
+        export.stream_nav_export(data_ids, tickers, fmt),
+        media_type=export.MEDIA_TYPES[fmt],
+    )
+
+
+@router.get("/backtest/nav")
+def export_navs(
+    ids: str = Query(description="쉼표로 구분한 data_id 목록 (예: 1,2,3)"),
+    fmt: ExportFormat = Query(default="ndjson", alias="format"),
+    db: Session = Depends(get_db),
+):
+    """여러 data_id 의 일별 NAV 와 리밸런싱 비중을 data_id 순으로 이어 스트리밍하는 API"""
+    try:
+        data_ids = sorted({int(i) for i in ids.split(",") if i.strip()})
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="ids 는 쉼표로 구분한 정수여야 합니다."
+        )
+    if not data_ids or len(data_ids) > EXPORT_MAX_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"ids 는 1~{EXPORT_MAX_IDS}개여야 합니다."
+        )
+    return _nav_export_response(db, data_ids, fmt)
+
+
+@router.get("/backtest/{data_id}/nav")
+def export_nav(
+    data_id: int,
+    fmt: ExportFormat = Query(default="ndjson", alias="format"),
+    db: Session = Depends(get_db),
+):
+    """data_id 의 일별 NAV 와 리밸런싱 비중을 ndjson/csv/arrow 로 스트리밍하는 API"""
+    return _nav_export_response(db, [data_id], fmt)
+
+
+@router.get("/backtest/{data_id}/rolling", response_model=BacktestRollingResp)
+async def get_rolling_by_data_id(
+    data_id: int,
+    window: int = Query(default=12, ge=2, description="NAV 시점 개수 기준 구간 길이"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """data_id 의 NAV 로 롤링 수익률·변동성·샤프 지수와 낙폭(underwater) 곡선을 반환하는 API"""
+    result = await get_rolling_metrics(db, data_id, window)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Backtest result not found")
+    return BacktestRollingResp(**result)
+
+
 @router.get("/backtest/{data_id}", response_model=BacktestDetailResp)
-def get_detail_by_data_id(data_id: int, db: Session = Depends(get_db)):
+async def get_detail_by_data_id(data_id: int, db: AsyncSession = Depends(get_async_db)):
     """data_id 에 해당하는 저장 항목을 불러와 계산한 통계값과  마지막 리밸런싱 비중을 반환하는 API"""
 
-    result, performance = proccess_backtest_detail(db, data_id)
+    result, performance = await proccess_backtest_detail(db, data_id)
     if not result:
         raise HTTPException(status_code=404, detail="Backtest result not found")
 
@@ -68,10 +275,10 @@ def get_detail_by_data_id(data_id: int, db: Session = Depends(get_db)):
         trade_date=result.trade_date,
         cost=result.trading_fee,
         caculate_month=result.rebalance_period,
+        nav_frequency=result.nav_frequency,
     )
-    last_rebalance_weight = [
-        (k, v) for k, v in result.rebalance_weights[-1].items() if k != "date"
-    ]
+    # 마이그레이션으로 채우지 못한 행은 비중·통계값이 NULL
+    last_rebalance_weight = list((result.last_rebalance_weight or {}).items())
     return BacktestDetailResp(
         input=input_data,
         output=BacktestOutputResp(
@@ -92,5 +299,7 @@ def delete_by_data_id(data_id: int, db: Session = Depends(get_db)):
     success = delete_backtest_result_by_id(db, data_id)
     if not success:
         raise HTTPException(status_code=404, detail="Backtest result not found")
+    result_cache.discard_data_id(data_id)
+    rolling_cache.discard_data_id(data_id)
 
     return {"message": "Backtest result deleted", "data_id": data_id}
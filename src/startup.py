@@ -0,0 +1,45 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+
+from src.database import SessionLocal, get_async_engine
+from src.metrics import STARTUP_SECONDS
+from src.snowball.prices import get_price_matrix
+from src.snowball.strategies import DEFAULT_STRATEGY
+
+
+def record_import_time() -> None:
+    """프로세스 시작부터 지금까지 사용한 CPU 시간 (대부분 모듈 import) 을 기록"""
+    STARTUP_SECONDS.set(time.process_time(), "import_cpu")
+
+
+@contextmanager
+def _warmup_phase(phase: str) -> Iterator[None]:
+    """구간 소요 시간을 snowball_startup_seconds 에 기록하고, 실패해도 예외를 전파하지 않음"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        # 워밍업은 최적화일 뿐이므로 실패해도 워커는 시작하고, 첫 요청에서 다시 시도됨
+        print(f"⚠️ 워밍업 실패 ({phase}): {e}")
+    finally:
+        elapsed = time.perf_counter() - started
+        STARTUP_SECONDS.set(elapsed, phase)
+        print(f"🔥 워밍업 {phase}: {elapsed * 1e3:.1f} ms")
+
+
+def warm_up_sync() -> None:
+    """동기 엔진을 만들고 기본 전략 종목의 가격 행렬·거래 달력 캐시를 채움 (스레드에서 실행)"""
+    with _warmup_phase("warmup_prices"):
+        with SessionLocal() as db:
+            price_matrix = get_price_matrix(db, list(DEFAULT_STRATEGY.tickers))
+        price_matrix.calendar
+
+
+async def warm_up_async() -> None:
+    """비동기 엔진을 만들고 커넥션 하나를 열어 풀에 넣어 둠"""
+    with _warmup_phase("warmup_async_db"):
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
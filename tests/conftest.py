@@ -0,0 +1,4 @@
+from benchmarks._common import set_dummy_env
+
+# src.config 를 import 하면 설정을 읽으므로 DB 접속 정보만 채움 (테스트는 DB 에 접속하지 않음)
+set_dummy_env()
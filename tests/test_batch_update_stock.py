@@ -0,0 +1,96 @@
+"""로컬 HTTP 서버에 저장해 둔 시세 페이지로 크롤러의 재시도·속도 제한 확인"""
+
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.config import get_setting
+from src.snowball import batch_update_stock
+from src.snowball.batch_update_stock import TokenBucket, crawl_latest_prices
+
+PAGES = Path(__file__).parent / "pages"
+
+
+class StubYahooHandler(BaseHTTPRequestHandler):
+    """/quote/{ticker}/history 에 저장된 페이지를 응답 (처음 failures[ticker] 번은 429)"""
+
+    failures: dict[str, int] = {}
+    requests: list[str] = []
+
+    def do_GET(self):
+        ticker = self.path.split("/")[2]
+        self.requests.append(ticker)
+        page = PAGES / f"{ticker}_history.html"
+        if self.failures.get(ticker, 0) > 0:
+            self.failures[ticker] -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+        elif page.exists():
+            body = page.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingBucket(TokenBucket):
+    acquired = 0
+
+    def acquire(self) -> None:
+        CountingBucket.acquired += 1
+        super().acquire()
+
+
+@pytest.fixture
+def base_url():
+    StubYahooHandler.failures = {}
+    StubYahooHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubYahooHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_crawl_settings(monkeypatch):
+    settings = get_setting()
+    monkeypatch.setattr(settings, "CRAWL_RATE_PER_SEC", 1000.0)
+    monkeypatch.setattr(settings, "CRAWL_BURST", 10)
+    monkeypatch.setattr(settings, "CRAWL_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "CRAWL_BACKOFF_FACTOR", 0.0)
+    CountingBucket.acquired = 0
+    monkeypatch.setattr(batch_update_stock, "TokenBucket", CountingBucket)
+
+
+def test_crawl_parses_saved_pages_and_skips_missing_ticker(base_url):
+    prices = crawl_latest_prices(["SPY", "QQQ", "NONE"], base_url)
+
+    assert prices == {
+        "SPY": (date(2025, 3, 14), 562.81),
+        "QQQ": (date(2025, 3, 14), 479.88),
+        "NONE": None,
+    }
+
+
+def test_retries_take_a_bucket_token_per_request(base_url):
+    StubYahooHandler.failures = {"SPY": 2, "QQQ": 5}
+
+    prices = crawl_latest_prices(["SPY", "QQQ"], base_url)
+
+    # SPY 는 두 번 재시도 후 성공, QQQ 는 최대 재시도(2회)까지 429 라 실패
+    assert prices == {"SPY": (date(2025, 3, 14), 562.81), "QQQ": None}
+    assert sorted(StubYahooHandler.requests) == ["QQQ"] * 3 + ["SPY"] * 3
+    assert CountingBucket.acquired == len(StubYahooHandler.requests)
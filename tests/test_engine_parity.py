@@ -0,0 +1,81 @@
+"""벡터화 엔진(compute_backtest)과 행 단위 루프 참조 구현(simulate_backtest_loop)의 결과 비교"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.snowball.flows import (
+    TICKERS,
+    calculate_rebalance_date_and_weights,
+    compute_backtest,
+    simulate_backtest_loop,
+)
+from src.snowball.prices import PriceMatrix
+from src.snowball.schema import BacktestReq
+
+END_DATE = datetime(2021, 12, 31)
+
+
+@pytest.fixture(scope="module")
+def price_matrix() -> PriceMatrix:
+    """기본 전략 종목의 합성 가격 (기하 브라운 운동, 영업일 기준)"""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2014-01-01", END_DATE)
+    log_returns = rng.normal(0.0003, 0.012, (len(dates), len(TICKERS)))
+    return PriceMatrix(
+        dates=dates.to_numpy(dtype="datetime64[D]"),
+        tickers=tuple(TICKERS),
+        prices=100 * np.exp(np.cumsum(log_returns, axis=0)),
+    )
+
+
+@pytest.mark.parametrize("trading_fee", [0.0, 0.002])
+@pytest.mark.parametrize("rebalance_period", [1, 3, 6, 12])
+@pytest.mark.parametrize("trade_date", [1, 15, 31])
+@pytest.mark.parametrize("start_month", [1, 7])
+def test_compute_backtest_matches_reference_loop(
+    price_matrix: PriceMatrix,
+    start_month: int,
+    trade_date: int,
+    rebalance_period: int,
+    trading_fee: float,
+):
+    backtest_req = BacktestReq(
+        start_year=2015,
+        start_month=start_month,
+        initial_investment=10000,
+        trade_date=trade_date,
+        trading_fee=trading_fee,
+        rebalance_period=rebalance_period,
+    )
+    df = price_matrix.to_frame()
+    rebalance_info = calculate_rebalance_date_and_weights(
+        datetime(2015, start_month, 1), END_DATE, backtest_req, df
+    )
+    nav_history, _ = simulate_backtest_loop(df, rebalance_info, backtest_req)
+
+    result = compute_backtest(price_matrix, backtest_req, END_DATE)
+    nav_series = result["nav_series"]
+    weight_series = result["weight_series"]
+
+    np.testing.assert_array_equal(
+        nav_series.dates,
+        np.array([record["date"] for record in nav_history], dtype="datetime64[D]"),
+    )
+    np.testing.assert_allclose(
+        nav_series.column("nav"),
+        [record["nav"] for record in nav_history],
+        rtol=1e-12,
+    )
+    np.testing.assert_array_equal(
+        weight_series.dates, np.array(list(rebalance_info), dtype="datetime64[D]")
+    )
+    np.testing.assert_allclose(
+        weight_series.values,
+        [
+            [dict(weights).get(ticker, 0.0) for ticker in weight_series.columns]
+            for weights in rebalance_info.values()
+        ],
+    )
@@ -0,0 +1,70 @@
+"""views 라우트 (DB 대신 조회 결과를 주입)"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.database import get_async_db
+from src.snowball import flows, views
+from src.snowball.rolling import rolling_cache
+
+
+async def _no_db():
+    yield None
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(views.router)
+    app.dependency_overrides[get_async_db] = _no_db
+    return TestClient(app)
+
+
+def test_detail_returns_backfilled_row_with_null_statistics(client, monkeypatch):
+    """마이그레이션에서 통계값·마지막 비중을 채우지 못한(NULL) 행도 200 으로 조회"""
+    row = SimpleNamespace(
+        data_id=1,
+        start_year=2020,
+        start_month=1,
+        initial_investment=10_000_000,
+        trade_date=1,
+        trading_fee=0.001,
+        rebalance_period=1,
+        nav_frequency="rebalance",
+        total_return=None,
+        cagr=None,
+        vol=None,
+        sharpe=None,
+        mdd=None,
+        last_rebalance_weight=None,
+    )
+
+    async def fake_summary(db, data_id):
+        return row if data_id == row.data_id else None
+
+    monkeypatch.setattr(flows, "get_backtest_summary_by_id", fake_summary)
+
+    resp = client.get("/backtest/1")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["output"] == {
+        "data_id": 1,
+        "total_return": None,
+        "cagr": None,
+        "vol": None,
+        "sharpe": None,
+        "mdd": None,
+    }
+    assert body["last_rebalance_weight"] == []
+
+    assert client.get("/backtest/2").status_code == 404
+
+
+def test_cache_stats_include_rolling_cache(client):
+    body = client.get("/backtest/cache/stats").json()
+
+    assert body["rolling"]["maxsize"] == rolling_cache.maxsize
+    assert set(body["rolling"]) == set(body) - {"rolling"}